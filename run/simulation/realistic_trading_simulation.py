@@ -2,8 +2,11 @@
 Realistic trading simulation with latency, slippage, and time delays.
 """
 
+import sys
+
 from dspy.api.api_registry import get_api
 from dspy.sim.simulation_engine import SimulationEngine, LatencyConfig  # noqa: F401
+from dspy.sim.signal_kernel import compute_signals
 import numpy as np
 
 # Configure realistic trading conditions
@@ -40,158 +43,192 @@ position_size_eth = 1.0
 stop_loss_pct = 0.002  # 0.2% stop loss
 take_profit_pct = 0.003  # 0.3% take profit
 
-# Track trades
-trades = []
-pending_stops = {}
-pending_profits = {}
+# Price multipliers for protective orders, fixed for the whole run
+stop_down = 1 - stop_loss_pct  # stop below a long entry
+stop_up = 1 + stop_loss_pct  # stop above a short entry
+tp_up = 1 + take_profit_pct  # take profit above a long entry
+tp_down = 1 - take_profit_pct  # take profit below a short entry
+bps = 10_000.0
 
 # Strategy: Mean reversion with protective stops
 print("Strategy: Mean reversion with stop-loss and take-profit orders")
 print("-" * 50)
 
-# Price tracking
-price_history = {"BTCUSDT": [], "ETHUSDT": []}
+# Price tracking: one row per tick, one column per symbol
+symbols = ["BTCUSDT", "ETHUSDT"]
+n_ticks = 300
 ma_period = 20
-
-for i in range(300):  # Process 300 ticks
-    if not sim.next():
+signal_threshold = 0.001  # 0.1% deviation from MA
+prices = np.empty((n_ticks, len(symbols)), dtype=np.float64)
+signals = np.zeros(len(symbols), dtype=np.int64)
+mas = np.zeros(len(symbols), dtype=np.float64)
+deviations = np.zeros(len(symbols), dtype=np.float64)
+
+# Pending protective order ids by symbol index, None if there is none
+pending_stops = [None] * len(symbols)
+pending_profits = [None] * len(symbols)
+
+# Track trades as one preallocated array per field; at most one entry per symbol
+# per signal check
+max_trades = (n_ticks // 10 + 1) * len(symbols)
+trade_sym = np.empty(max_trades, dtype=np.int8)  # index into symbols
+trade_side = np.empty(max_trades, dtype=np.int8)  # 1 for buy, -1 for sell
+trade_price = np.empty(max_trades, dtype=np.float64)
+trade_size = np.empty(max_trades, dtype=np.float64)
+trade_tick = np.empty(max_trades, dtype=np.int32)
+n_trades = 0
+
+# Buffer output from the tick loop and write it out in bulk
+log = []
+
+# Bind engine methods once; the tick loop calls them hundreds of times
+next_tick = sim.next
+get_mids = sim.get_mids
+get_positions = sim.get_positions
+place_order = sim.place_order
+wait_seconds = sim.wait_seconds
+
+for i in range(n_ticks):  # Process 300 ticks
+    if not next_tick():
         break
 
     # Update price history
-    for symbol in ["BTCUSDT", "ETHUSDT"]:
-        price = sim.get_mid(symbol)
-        price_history[symbol].append(price)
+    prices[i] = get_mids(symbols)
 
     # Skip until we have enough data for MA
-    if len(price_history["BTCUSDT"]) < ma_period:
+    if i + 1 < ma_period:
         continue
 
     # Calculate signals every 10 ticks
     if i % 10 == 0:
-        for symbol in ["BTCUSDT", "ETHUSDT"]:
-            prices = np.array(price_history[symbol][-ma_period:])
-            ma = np.mean(prices)
-            current_price = prices[-1]
-            deviation = (current_price - ma) / ma
-
-            position = sim.get_positions([symbol])
+        compute_signals(
+            prices[i - ma_period + 1 : i + 1], signal_threshold, signals, mas, deviations
+        )
+        for k, symbol in enumerate(symbols):
+            signal = signals[k]
+            ma = mas[k]
+            deviation = deviations[k]
+            current_price = prices[i, k]
+
+            position = get_positions([symbol])
             pos_size = position_size_btc if symbol == "BTCUSDT" else position_size_eth
 
             # Entry signals
             if abs(position["size"]) < 0.0001:  # No position
-                if deviation < -0.001:  # Price 0.1% below MA - buy signal
+                if signal == 1:  # Price 0.1% below MA - buy signal
                     # Place market buy with simulated latency
-                    order = sim.place_order(symbol, pos_size, type="Market")
+                    order = place_order(symbol, pos_size, type="Market")
 
-                    print(f"\n[{i}] {symbol} BUY SIGNAL")
-                    print(f"  Price: ${current_price:.2f} (MA: ${ma:.2f})")
-                    print(f"  Deviation: {deviation * 100:.2f}%")
-                    print(f"  Order ID: {order['order_id'][:8]}...")
+                    log.append(f"\n[{i}] {symbol} BUY SIGNAL\n")
+                    log.append(f"  Price: ${current_price:.2f} (MA: ${ma:.2f})\n")
+                    log.append(f"  Deviation: {deviation * 100:.2f}%\n")
+                    log.append(f"  Order ID: {order['order_id'][:8]}...\n")
 
                     # Wait for execution before placing stops
-                    sim.wait_seconds(0.1)  # 100ms wait
+                    wait_seconds(0.1)  # 100ms wait
 
                     # Check if filled
-                    position = sim.get_positions([symbol])
+                    position = get_positions([symbol])
                     if position["size"] > 0:
                         entry_price = position["aep"]
                         actual_slippage = (
-                            (entry_price - current_price) / current_price * 10000
+                            (entry_price - current_price) / current_price * bps
                         )
-                        print(
-                            f"  Filled at: ${entry_price:.2f} (slippage: {actual_slippage:.1f} bps)"
+                        log.append(
+                            f"  Filled at: ${entry_price:.2f} (slippage: {actual_slippage:.1f} bps)\n"
                         )
 
                         # Place stop loss and take profit
-                        stop_price = entry_price * (1 - stop_loss_pct)
-                        profit_price = entry_price * (1 + take_profit_pct)
+                        stop_price = entry_price * stop_down
+                        profit_price = entry_price * tp_up
 
-                        stop_order = sim.place_order(
+                        stop_order = place_order(
                             symbol, -pos_size, price=stop_price, type="Limit"
                         )
-                        profit_order = sim.place_order(
+                        profit_order = place_order(
                             symbol, -pos_size, price=profit_price, type="Limit"
                         )
 
-                        pending_stops[symbol] = stop_order["order_id"]
-                        pending_profits[symbol] = profit_order["order_id"]
+                        pending_stops[k] = stop_order["order_id"]
+                        pending_profits[k] = profit_order["order_id"]
 
-                        print(f"  Stop Loss at: ${stop_price:.2f}")
-                        print(f"  Take Profit at: ${profit_price:.2f}")
+                        log.append(f"  Stop Loss at: ${stop_price:.2f}\n")
+                        log.append(f"  Take Profit at: ${profit_price:.2f}\n")
 
-                        trades.append(
-                            {
-                                "symbol": symbol,
-                                "side": "BUY",
-                                "price": entry_price,
-                                "size": pos_size,
-                                "time": i,
-                            }
-                        )
+                        trade_sym[n_trades] = k
+                        trade_side[n_trades] = 1
+                        trade_price[n_trades] = entry_price
+                        trade_size[n_trades] = pos_size
+                        trade_tick[n_trades] = i
+                        n_trades += 1
 
-                elif deviation > 0.001:  # Price 0.1% above MA - sell signal
+                elif signal == -1:  # Price 0.1% above MA - sell signal
                     # Place market sell
-                    order = sim.place_order(symbol, -pos_size, type="Market")
+                    order = place_order(symbol, -pos_size, type="Market")
 
-                    print(f"\n[{i}] {symbol} SELL SIGNAL")
-                    print(f"  Price: ${current_price:.2f} (MA: ${ma:.2f})")
-                    print(f"  Deviation: {deviation * 100:.2f}%")
-                    print(f"  Order ID: {order['order_id'][:8]}...")
+                    log.append(f"\n[{i}] {symbol} SELL SIGNAL\n")
+                    log.append(f"  Price: ${current_price:.2f} (MA: ${ma:.2f})\n")
+                    log.append(f"  Deviation: {deviation * 100:.2f}%\n")
+                    log.append(f"  Order ID: {order['order_id'][:8]}...\n")
 
                     # Wait and check execution
-                    sim.wait_seconds(0.1)
+                    wait_seconds(0.1)
 
-                    position = sim.get_positions([symbol])
+                    position = get_positions([symbol])
                     if position["size"] < 0:
                         entry_price = position["aep"]
                         actual_slippage = (
-                            (current_price - entry_price) / current_price * 10000
+                            (current_price - entry_price) / current_price * bps
                         )
-                        print(
-                            f"  Filled at: ${entry_price:.2f} (slippage: {actual_slippage:.1f} bps)"
+                        log.append(
+                            f"  Filled at: ${entry_price:.2f} (slippage: {actual_slippage:.1f} bps)\n"
                         )
 
                         # Place protective orders
-                        stop_price = entry_price * (1 + stop_loss_pct)
-                        profit_price = entry_price * (1 - take_profit_pct)
+                        stop_price = entry_price * stop_up
+                        profit_price = entry_price * tp_down
 
-                        stop_order = sim.place_order(
+                        stop_order = place_order(
                             symbol, pos_size, price=stop_price, type="Limit"
                         )
-                        profit_order = sim.place_order(
+                        profit_order = place_order(
                             symbol, pos_size, price=profit_price, type="Limit"
                         )
 
-                        pending_stops[symbol] = stop_order["order_id"]
-                        pending_profits[symbol] = profit_order["order_id"]
+                        pending_stops[k] = stop_order["order_id"]
+                        pending_profits[k] = profit_order["order_id"]
 
-                        print(f"  Stop Loss at: ${stop_price:.2f}")
-                        print(f"  Take Profit at: ${profit_price:.2f}")
+                        log.append(f"  Stop Loss at: ${stop_price:.2f}\n")
+                        log.append(f"  Take Profit at: ${profit_price:.2f}\n")
 
-                        trades.append(
-                            {
-                                "symbol": symbol,
-                                "side": "SELL",
-                                "price": entry_price,
-                                "size": pos_size,
-                                "time": i,
-                            }
-                        )
+                        trade_sym[n_trades] = k
+                        trade_side[n_trades] = -1
+                        trade_price[n_trades] = entry_price
+                        trade_size[n_trades] = pos_size
+                        trade_tick[n_trades] = i
+                        n_trades += 1
 
     # Simulate waiting between checks (1 second simulation time)
     if i % 10 == 9:
-        sim.wait_seconds(1)
+        wait_seconds(1)
+
+    # Flush buffered output every 100 ticks
+    if i % 100 == 99:
+        sys.stdout.write("".join(log))
+        log.clear()
+
+sys.stdout.write("".join(log))
 
 # Close any remaining positions
 print("\n\nClosing remaining positions...")
-for symbol in ["BTCUSDT", "ETHUSDT"]:
+for k, symbol in enumerate(symbols):
     position = sim.get_positions([symbol])
     if abs(position["size"]) > 0.0001:
         # Cancel pending orders
-        if symbol in pending_stops:
-            sim.cancel_order(symbol, pending_stops[symbol])
-        if symbol in pending_profits:
-            sim.cancel_order(symbol, pending_profits[symbol])
+        if pending_stops[k] is not None:
+            sim.cancel_order(symbol, pending_stops[k])
+        if pending_profits[k] is not None:
+            sim.cancel_order(symbol, pending_profits[k])
 
         # Close position
         sim.close_positions([symbol])
@@ -215,15 +252,14 @@ print(f"Final balance: ${final_balance:,.2f}")
 print(
     f"Net P&L: ${final_balance - 50000.00:+,.2f} ({(final_balance / 50000 - 1) * 100:+.2f}%)"
 )
-print(f"Total trades: {len(trades)}")
+print(f"Total trades: {n_trades}")
 
 # Trade analysis
-if trades:
+if n_trades:
     print("\nTrade Analysis:")
-    btc_trades = [t for t in trades if t["symbol"] == "BTCUSDT"]
-    eth_trades = [t for t in trades if t["symbol"] == "ETHUSDT"]
-    print(f"BTC trades: {len(btc_trades)}")
-    print(f"ETH trades: {len(eth_trades)}")
+    trades_per_symbol = np.bincount(trade_sym[:n_trades], minlength=len(symbols))
+    print(f"BTC trades: {trades_per_symbol[0]}")
+    print(f"ETH trades: {trades_per_symbol[1]}")
 
     # Get execution history for slippage analysis
     executions = sim.get_trade_history(limit=100)
@@ -236,7 +272,7 @@ if trades:
 
         if slippages:
             print("\nExecution Quality:")
-            print(f"Average slippage: {np.mean(slippages):.1f} bps")
-            print(f"Max slippage: {np.max(slippages):.1f} bps")
+            print(f"Average slippage: {sum(slippages) / len(slippages):.1f} bps")
+            print(f"Max slippage: {max(slippages):.1f} bps")
 
 print("\nSimulation complete!")
@@ -1,14 +1,21 @@
 """
-Example demonstrating real-time data simulation using batch_size=1
+Example demonstrating real-time data simulation from streamed book data
 """
 
 import polars as pl
 import time
+from collections import deque
+
 from dspy.hdb.registry import get_dataset
 
 
-def simulate_realtime_feed():
-    """Simulate real-time data feed with batch_size=1"""
+def simulate_realtime_feed(pace_hz: float | None = None):
+    """
+    Simulate real-time data feed, streaming in batches and replaying tick by tick
+
+    Args:
+        pace_hz: Ticks per second to replay at, or None to run as fast as possible
+    """
 
     # Initialize the Tardis data loader
     tardis = get_dataset("tardis")
@@ -16,38 +23,49 @@ def simulate_realtime_feed():
     # Define time range and product
     times = ["241201.000000", "241201.000500"]  # 5 seconds of data
     product = "BTCUSDT"
+    max_ticks = 50  # Limit output for demo
 
     print("=== Real-time Data Simulation ===")
     print(f"Simulating live feed for {product}")
     print("Press Ctrl+C to stop\n")
 
+    # Derived columns, built once and applied to every batch
+    bid = pl.col("bids[0].price")
+    ask = pl.col("asks[0].price")
+    mid = (bid + ask) * 0.5
+    tick_exprs = [
+        pl.from_epoch(pl.col("ts") // 1_000_000, time_unit="ms")
+        .dt.strftime("%H:%M:%S.%3f")
+        .alias("ts_readable"),
+        bid,
+        pl.col("bids[0].amount"),
+        ask,
+        pl.col("asks[0].amount"),
+        mid.alias("mid"),
+        ((ask - bid) / mid * 10000).alias("spread_bps"),
+    ]
+
     tick_count = 0
+    if pace_hz is not None:
+        # Sleep until fixed deadlines so the rate does not drift with processing time
+        period = 1.0 / pace_hz
+        next_deadline = time.monotonic() + period
 
     try:
-        for batch in tardis.stream_book(product, times, depth=1, batch_size=1):
-            tick_count += 1
-
-            # Extract tick data
-            if batch.height > 0:
-                row = batch.row(0)
-                ts = row[0]
-                bid_price = row[4]  # bids[0].price
-                ask_price = row[2]  # asks[0].price
-                bid_size = row[5]  # bids[0].amount
-                ask_size = row[3]  # asks[0].amount
-
-                # Calculate mid price and spread
-                mid_price = (bid_price + ask_price) / 2
-                spread = ask_price - bid_price
-                spread_bps = (spread / mid_price) * 10000
-
-                # Format timestamp for display
-                ts_ms = ts // 1_000_000
-                ts_readable = (
-                    pl.from_epoch([ts_ms], time_unit="ms")
-                    .dt.strftime("%H:%M:%S.%3f")
-                    .item()
-                )
+        for batch in tardis.stream_book(product, times, depth=1, batch_size=4096):
+            # Compute derived columns for the whole batch at once
+            ticks = batch.head(max_ticks - tick_count).select(tick_exprs)
+
+            for (
+                ts_readable,
+                bid_price,
+                bid_size,
+                ask_price,
+                ask_size,
+                mid_price,
+                spread_bps,
+            ) in ticks.iter_rows():
+                tick_count += 1
 
                 # Print tick data (like a real-time feed)
                 print(
@@ -58,12 +76,14 @@ def simulate_realtime_feed():
                     f"Spread={spread_bps:.1f}bps"
                 )
 
-                # Simulate processing time (remove for max speed)
-                time.sleep(0.01)  # 10ms delay
+                if pace_hz is not None:
+                    now = time.monotonic()
+                    if next_deadline > now:
+                        time.sleep(next_deadline - now)
+                    next_deadline += period
 
-                # Limit output for demo
-                if tick_count >= 50:
-                    break
+            if tick_count >= max_ticks:
+                break
 
     except KeyboardInterrupt:
         print(f"\nStopped after {tick_count} ticks")
@@ -82,30 +102,27 @@ def simulate_with_feature_engineering():
 
     print("\n=== Real-time with Feature Engineering ===")
 
-    # Rolling window for features
-    price_window = []
+    # Rolling window for features, with a running sum for O(1) SMA updates
     window_size = 10
+    price_window = deque(maxlen=window_size)
+    running_sum = 0.0
 
     tick_count = 0
+    max_ticks = 30  # Limit output for demo
+    mid_expr = (pl.col("bids[0].price") + pl.col("asks[0].price")) * 0.5
 
     try:
-        for batch in tardis.stream_book(product, times, depth=3, batch_size=1):
-            tick_count += 1
-
-            if batch.height > 0:
-                # Calculate mid price
-                mid_price = (
-                    (
-                        batch.select(pl.col("bids[0].price"))
-                        + batch.select(pl.col("asks[0].price"))
-                    )
-                    / 2
-                ).item()
+        for batch in tardis.stream_book(product, times, depth=3, batch_size=4096):
+            # Calculate mid prices for the whole batch
+            mids = batch.head(max_ticks - tick_count).select(mid_expr).to_series()
+
+            for mid_price in mids:
+                tick_count += 1
 
                 # Update rolling window
+                old = price_window[0] if len(price_window) == window_size else 0.0
                 price_window.append(mid_price)
-                if len(price_window) > window_size:
-                    price_window.pop(0)
+                running_sum += mid_price - old
 
                 # Calculate features
                 if len(price_window) >= 2:
@@ -113,7 +130,7 @@ def simulate_with_feature_engineering():
                     price_change_bps = (price_change / price_window[-2]) * 10000
 
                     if len(price_window) >= window_size:
-                        sma = sum(price_window) / len(price_window)
+                        sma = running_sum / window_size
                         deviation = mid_price - sma
 
                         print(
@@ -131,9 +148,8 @@ def simulate_with_feature_engineering():
                             f"(building window...)"
                         )
 
-                # Limit output for demo
-                if tick_count >= 30:
-                    break
+            if tick_count >= max_ticks:
+                break
 
     except Exception as e:
         print(f"Error: {e}")
@@ -142,5 +158,5 @@ def simulate_with_feature_engineering():
 
 
 if __name__ == "__main__":
-    simulate_realtime_feed()
+    simulate_realtime_feed(pace_hz=100.0)
     simulate_with_feature_engineering()
@@ -20,21 +20,25 @@ print(f"Initial balance: ${sim.get_wallet_balance():.2f}")
 print()
 
 # Run a simple strategy
+next_tick = sim.next
+get_mid = sim.get_mid
+place_order = sim.place_order
+
 previous_price = None
 for i in range(100):  # Process 100 data points
-    if not sim.next():
+    if not next_tick():
         break
 
     # Get current market data
-    mid_price = sim.get_mid("BTCUSDT")
+    mid_price = get_mid("BTCUSDT")
 
     # Simple strategy: buy when price drops, sell when price rises
     if previous_price is not None:
         if mid_price < previous_price * 0.999:  # Price dropped by 0.1%
-            sim.place_order("BTCUSDT", 0.01, type="Market")  # Buy 0.01 BTC
+            place_order("BTCUSDT", 0.01, type="Market")  # Buy 0.01 BTC
             print(f"Step {i}: BUY at {mid_price:.2f}")
         elif mid_price > previous_price * 1.001:  # Price rose by 0.1%
-            sim.place_order("BTCUSDT", -0.01, type="Market")  # Sell 0.01 BTC
+            place_order("BTCUSDT", -0.01, type="Market")  # Sell 0.01 BTC
             print(f"Step {i}: SELL at {mid_price:.2f}")
 
     previous_price = mid_price
@@ -153,15 +153,15 @@ rt_sim = get_api(
 print("Running in real-time mode (1:1 time scaling)")
 print("Processing 3 data points with actual time delays...")
 
-start_real_time = time.time()
+start_real_time = time.monotonic_ns()
 
 for i in range(3):
     rt_sim.next()
     current_price = rt_sim.get_mid("BTCUSDT")
     print(f"Step {i}: Price = ${current_price:.2f}")
 
-end_real_time = time.time()
-real_elapsed = end_real_time - start_real_time
+end_real_time = time.monotonic_ns()
+real_elapsed = (end_real_time - start_real_time) / 1_000_000_000
 
 print(f"\nReal time elapsed: {real_elapsed:.3f} seconds")
 print("(In real-time mode, simulation time matches wall clock time)")
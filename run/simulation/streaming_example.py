@@ -2,7 +2,6 @@
 Example demonstrating streaming functionality for Tardis data.
 """
 
-import polars as pl
 from dspy.hdb.registry import get_dataset
 
 
@@ -40,11 +39,10 @@ def stream_book_example():
             if batch_rows > 0:
                 # Calculate mid price for the batch
                 mid_price = (
-                    batch.select(pl.col("bids[0].price"))
-                    + batch.select(pl.col("asks[0].price"))
-                ) / 2
+                    batch["bids[0].price"].to_numpy() + batch["asks[0].price"].to_numpy()
+                ) * 0.5
                 print(
-                    f"  Mid price range: {mid_price.min().item():.2f} - {mid_price.max().item():.2f}"
+                    f"  Mid price range: {mid_price.min():.2f} - {mid_price.max():.2f}"
                 )
 
             # Limit output for demo
@@ -2,10 +2,28 @@
 Examples of timing control in streaming simulations
 """
 
-import polars as pl
 import time
+
+import numpy as np
+import polars as pl
+
 from dspy.hdb.registry import get_dataset
 
+# Top-of-book column names in streamed book batches
+bid_col = "bids[0].price"
+ask_col = "asks[0].price"
+bid_size_col = "bids[0].amount"
+ask_size_col = "asks[0].amount"
+
+# Stream in large batches and do per-tick work on whole columns
+stream_batch_size = 1024
+mid_expr = ((pl.col(bid_col) + pl.col(ask_col)) * 0.5).alias("mid")
+ts_readable_expr = (
+    pl.from_epoch(pl.col("ts") // 1_000_000, time_unit="ms")
+    .dt.strftime("%H:%M:%S.%3f")
+    .alias("ts_readable")
+)
+
 
 def simulate_with_processing_delay():
     """Simulate real-time with processing delays using time.sleep()"""
@@ -13,6 +31,7 @@ def simulate_with_processing_delay():
     tardis = get_dataset("tardis")
     times = ["241201.000000", "241201.001000"]  # 10 seconds of data
     product = "BTCUSDT"
+    max_ticks = 50
 
     print("=== Processing Delay Simulation ===")
     print("Simulating 1ms processing time per tick\n")
@@ -20,18 +39,13 @@ def simulate_with_processing_delay():
     start_time = time.time()
     tick_count = 0
 
-    for batch in tardis.stream_book(product, times, depth=1, batch_size=1):
-        tick_count += 1
+    for batch in tardis.stream_book(
+        product, times, depth=1, batch_size=stream_batch_size
+    ):
+        mids = batch.head(max_ticks - tick_count).select(mid_expr).to_series()
 
-        if batch.height > 0:
-            # Extract data
-            mid_price = (
-                (
-                    batch.select(pl.col("bids[0].price"))
-                    + batch.select(pl.col("asks[0].price"))
-                )
-                / 2
-            ).item()
+        for mid_price in mids:
+            tick_count += 1
 
             # Simulate processing time (e.g., strategy computation)
             time.sleep(0.001)  # 1ms processing delay
@@ -43,8 +57,8 @@ def simulate_with_processing_delay():
                     f"(Elapsed: {elapsed:.2f}s)"
                 )
 
-            if tick_count >= 50:
-                break
+        if tick_count >= max_ticks:
+            break
 
     total_time = time.time() - start_time
     print(f"\nProcessed {tick_count} ticks in {total_time:.2f}s")
@@ -57,6 +71,7 @@ def simulate_replay_at_original_speed():
     tardis = get_dataset("tardis")
     times = ["241201.000000", "241201.001000"]  # 10 seconds of data
     product = "BTCUSDT"
+    max_ticks = 20
 
     print("\n=== Original Speed Replay ===")
     print("Replaying data at original timestamp intervals\n")
@@ -65,50 +80,44 @@ def simulate_replay_at_original_speed():
     tick_count = 0
     start_time = time.time()
 
-    for batch in tardis.stream_book(product, times, depth=1, batch_size=1):
-        tick_count += 1
-
-        if batch.height > 0:
-            # Get current timestamp (nanoseconds)
-            current_ts = batch.select(pl.col("ts")).item()
+    for batch in tardis.stream_book(
+        product, times, depth=1, batch_size=stream_batch_size
+    ):
+        # Format the batch's timestamps in one pass rather than per tick
+        ticks = batch.head(max_ticks - tick_count).select(
+            "ts", mid_expr, ts_readable_expr
+        )
+        ts = ticks.get_column("ts").to_numpy()
+
+        # Time differences in seconds, including the gap to the previous batch
+        prepend = ts[0] if prev_timestamp is None else prev_timestamp
+        time_diffs = np.diff(ts, prepend=prepend) / 1_000_000_000
+        # Sleep for the actual time difference (scaled down for demo)
+        scaled_sleeps = np.minimum(time_diffs * 0.001, 0.1)  # Scale by 0.1% for demo
+
+        for current_ts, mid_price, ts_readable, scaled_sleep in zip(
+            ts.tolist(),
+            ticks.get_column("mid"),
+            ticks.get_column("ts_readable"),
+            scaled_sleeps.tolist(),
+        ):
+            tick_count += 1
 
             if prev_timestamp is not None:
-                # Calculate time difference in seconds
-                time_diff = (current_ts - prev_timestamp) / 1_000_000_000
-
-                # Sleep for the actual time difference (scaled down for demo)
-                scaled_sleep = min(time_diff * 0.001, 0.1)  # Scale by 0.1% for demo
                 time.sleep(scaled_sleep)
-
             prev_timestamp = current_ts
 
-            mid_price = (
-                (
-                    batch.select(pl.col("bids[0].price"))
-                    + batch.select(pl.col("asks[0].price"))
-                )
-                / 2
-            ).item()
-
-            # Show timestamp
-            ts_ms = current_ts // 1_000_000
-            ts_readable = (
-                pl.from_epoch([ts_ms], time_unit="ms")
-                .dt.strftime("%H:%M:%S.%3f")
-                .item()
-            )
-
             print(f"[{ts_readable}] Tick {tick_count}: Price={mid_price:.2f}")
 
-            if tick_count >= 20:
-                break
+        if tick_count >= max_ticks:
+            break
 
     total_time = time.time() - start_time
     print(f"\nReplayed {tick_count} ticks in {total_time:.2f}s")
 
 
 def simulate_fixed_frequency_sampling():
-    """Sample data at fixed intervals (every second/minute)"""
+    """Sample data at fixed intervals of data time (every second/minute)"""
 
     tardis = get_dataset("tardis")
     times = ["241201.000000", "241201.003000"]  # 30 seconds of data
@@ -117,46 +126,46 @@ def simulate_fixed_frequency_sampling():
     print("\n=== Fixed Frequency Sampling ===")
     print("Sampling every 1 second from streaming data\n")
 
-    sample_interval = 1.0  # seconds
-    last_sample_time = time.time()
-    current_batch = None
+    sample_interval_ns = 1_000_000_000  # 1 second of data time
+    max_samples = 10
+    first_ts = None
+    last_bucket = 0  # Index of the last sampled interval since first_ts
     sample_count = 0
-
-    for batch in tardis.stream_book(product, times, depth=1, batch_size=1):
-        # Always keep the latest batch
-        current_batch = batch
-
-        # Check if it's time to sample
-        current_time = time.time()
-        if current_time - last_sample_time >= sample_interval:
+    sample_exprs = None  # Built once the first timestamp is known
+
+    for batch in tardis.stream_book(
+        product, times, depth=1, batch_size=stream_batch_size
+    ):
+        if first_ts is None:
+            first_ts = batch.get_column("ts")[0]
+            sample_exprs = [
+                ((pl.col("ts") - first_ts) // sample_interval_ns).alias("bucket"),
+                mid_expr,
+                bid_size_col,
+                ask_size_col,
+            ]
+
+        # Sample the first tick at or after each interval boundary
+        samples = (
+            batch.select(sample_exprs)
+            .filter(pl.col("bucket") > last_bucket)
+            .unique(subset="bucket", keep="first", maintain_order=True)
+            .head(max_samples - sample_count)
+        )
+
+        for bucket, mid_price, bid_size, ask_size in samples.iter_rows():
             sample_count += 1
+            last_bucket = bucket
 
-            if current_batch is not None and current_batch.height > 0:
-                mid_price = (
-                    (
-                        current_batch.select(pl.col("bids[0].price"))
-                        + current_batch.select(pl.col("asks[0].price"))
-                    )
-                    / 2
-                ).item()
-
-                bid_size = current_batch.select(pl.col("bids[0].amount")).item()
-                ask_size = current_batch.select(pl.col("asks[0].amount")).item()
-
-                print(
-                    f"Sample {sample_count}: "
-                    f"Price={mid_price:.2f} "
-                    f"BidSize={bid_size:.2f} "
-                    f"AskSize={ask_size:.2f}"
-                )
-
-                last_sample_time = current_time
-
-            if sample_count >= 10:
-                break
+            print(
+                f"Sample {sample_count}: "
+                f"Price={mid_price:.2f} "
+                f"BidSize={bid_size:.2f} "
+                f"AskSize={ask_size:.2f}"
+            )
 
-        # Small sleep to avoid busy waiting
-        time.sleep(0.001)
+        if sample_count >= max_samples:
+            break
 
     print(f"\nCollected {sample_count} samples")
 
@@ -173,41 +182,36 @@ def simulate_burst_then_wait():
 
     batch_size = 10
     wait_time = 2.0  # seconds
+    max_bursts = 3
     tick_count = 0
     burst_count = 0
 
-    batch_buffer = []
+    # Mid prices streamed but not yet processed
+    pending = np.empty(0, dtype=np.float64)
 
-    for batch in tardis.stream_book(product, times, depth=1, batch_size=1):
-        tick_count += 1
-        batch_buffer.append(batch)
+    for batch in tardis.stream_book(
+        product, times, depth=1, batch_size=stream_batch_size
+    ):
+        mids = batch.select(mid_expr).to_series().to_numpy()
+        pending = np.concatenate((pending, mids))
 
         # Process in bursts
-        if len(batch_buffer) >= batch_size:
+        while len(pending) >= batch_size and burst_count < max_bursts:
+            burst, pending = pending[:batch_size], pending[batch_size:]
             burst_count += 1
-            print(f"Burst {burst_count}: Processing {len(batch_buffer)} ticks...")
+            print(f"Burst {burst_count}: Processing {len(burst)} ticks...")
 
             # Process the batch
-            for i, tick_batch in enumerate(batch_buffer):
-                if tick_batch.height > 0:
-                    mid_price = (
-                        (
-                            tick_batch.select(pl.col("bids[0].price"))
-                            + tick_batch.select(pl.col("asks[0].price"))
-                        )
-                        / 2
-                    ).item()
-                    print(
-                        f"  Tick {tick_count - batch_size + i + 1}: Price={mid_price:.2f}"
-                    )
-
-            # Clear buffer and wait
-            batch_buffer = []
+            for mid_price in burst.tolist():
+                tick_count += 1
+                print(f"  Tick {tick_count}: Price={mid_price:.2f}")
+
+            # Wait before the next burst
             print(f"  Waiting {wait_time} seconds...")
             time.sleep(wait_time)
 
-            if burst_count >= 3:
-                break
+        if burst_count >= max_bursts:
+            break
 
     print(f"\nProcessed {tick_count} ticks in {burst_count} bursts")
 
@@ -12,49 +12,99 @@ Note: Requires valid BYBIT_API_KEY and BYBIT_API_SECRET in environment variables
 
 import asyncio
 import os
+import queue
+import sys
+import threading
 import time
 from collections import defaultdict
 from datetime import datetime
 
+import numpy as np
 import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 from dspy.api.bybit.websocket_stream import BybitWebSocketStream
 
+# Column types of the ExecutionRecord fields produced by BybitWebSocketStream
+EXECUTION_SCHEMA = pa.schema([
+    ("exec_id", pa.string()),
+    ("order_id", pa.string()),
+    ("order_link_id", pa.string()),
+    ("symbol", pa.string()),
+    ("side", pa.int8()),
+    ("price", pa.float64()),
+    ("qty", pa.float64()),
+    ("exec_type", pa.string()),
+    ("exec_value", pa.float64()),
+    ("exec_fee", pa.float64()),
+    ("exec_time", pa.string()),
+    ("is_maker", pa.bool_()),
+    ("fee_rate", pa.float64()),
+    ("trade_iv", pa.float64()),
+    ("mark_price", pa.float64()),
+    ("index_price", pa.float64()),
+    ("underlying_price", pa.float64()),
+    ("block_trade_id", pa.string()),
+])
+
 
 class AccountMonitor:
     """Monitors account activity through private WebSocket streams."""
     
-    def __init__(self):
-        """Initialize account monitor."""
+    def __init__(self, executions_path="recent_executions.parquet", chunk_size=1024):
+        """
+        Initialize account monitor.
+        
+        Args:
+            executions_path: Parquet file that executions are streamed to
+            chunk_size: Number of executions buffered before each write
+        """
         self.positions = {}  # Current positions by symbol
         self.active_orders = {}  # Active orders by order_id
-        self.recent_executions = []  # Recent fills
         self.wallet_balances = {}  # Wallet balances by coin
         
+        # Recent fills as a ring buffer with one preallocated array per field
+        self._exec_cap = 100
+        self._exec_symbol = [""] * self._exec_cap
+        self._exec_side = np.empty(self._exec_cap, dtype=np.int8)
+        self._exec_price = np.empty(self._exec_cap, dtype=np.float64)
+        self._exec_qty = np.empty(self._exec_cap, dtype=np.float64)
+        self._exec_fee = np.empty(self._exec_cap, dtype=np.float64)
+        self._exec_is_maker = np.empty(self._exec_cap, dtype=np.bool_)
+        self._exec_head = 0  # Next slot to write
+        self._exec_count = 0  # Number of valid slots
+        
+        # Executions are written to Parquet in chunks; the writer opens on first flush
+        self.executions_path = executions_path
+        self.chunk_size = chunk_size
+        self._exec_rows = []
+        self._exec_writer = None
+        
         # Statistics
         self.stats = defaultdict(int)
         self.start_time = time.time()
         
+        # Updates are formatted and printed on a separate thread so the
+        # WebSocket callbacks only enqueue them
+        self._log_q = queue.SimpleQueue()
+        self._log_thread = threading.Thread(target=self._log_worker, daemon=True)
+        self._log_thread.start()
+        
     def on_position(self, data):
         """Handle position updates."""
-        symbol = data['symbol']
+        symbol = data.symbol
         self.positions[symbol] = data
         self.stats['position_updates'] += 1
         
         # Log significant position changes
-        if data['size'] > 0:
-            side = "LONG" if data['side'] == 1 else "SHORT"
-            print(f"\n📊 Position Update: {symbol}")
-            print(f"   Side: {side}, Size: {data['size']}")
-            print(f"   Entry: ${data['entry_price']:.2f}, Mark: ${data['mark_price']:.2f}")
-            print(f"   Unrealized P&L: ${data['unrealized_pnl']:.2f}")
-            if data['liq_price']:
-                print(f"   Liquidation Price: ${data['liq_price']:.2f}")
+        if data.size > 0:
+            self._log_q.put(("position", data))
                 
     def on_order(self, data):
         """Handle order updates."""
-        order_id = data['order_id']
-        status = data['order_status']
+        order_id = data.order_id
+        status = data.order_status
         
         # Track active orders
         if status in ['New', 'PartiallyFilled']:
@@ -65,59 +115,157 @@ class AccountMonitor:
         self.stats['order_updates'] += 1
         
         # Log order status changes
-        side = "BUY" if data['side'] == 1 else "SELL"
-        symbol = data['symbol']
-        qty = data['qty']
-        price = data['price']
-        
-        if status == 'New':
-            print(f"\n📋 New Order: {symbol} {side} {qty} @ ${price:.2f}")
-            print(f"   Order ID: {order_id}")
-            print(f"   Type: {data['order_type']}")
-            
-        elif status == 'Filled':
-            print(f"\n✅ Order Filled: {symbol} {side} {qty}")
-            print(f"   Avg Price: ${data['cum_exec_value'] / data['cum_exec_qty']:.2f}")
-            print(f"   Fees: ${data['cum_exec_fee']:.4f}")
-            
-        elif status == 'Cancelled':
-            print(f"\n❌ Order Cancelled: {symbol} {side} {qty} @ ${price:.2f}")
-            
-        elif status == 'Rejected':
-            print(f"\n🚫 Order Rejected: {symbol} {side} {qty} @ ${price:.2f}")
+        self._log_q.put(("order", data))
             
     def on_execution(self, data):
         """Handle execution/fill updates."""
-        self.recent_executions.append(data)
-        if len(self.recent_executions) > 100:
-            self.recent_executions.pop(0)
-            
+        head = self._exec_head
+        self._exec_symbol[head] = data.symbol
+        self._exec_side[head] = data.side
+        self._exec_price[head] = data.price
+        self._exec_qty[head] = data.qty
+        self._exec_fee[head] = data.exec_fee
+        self._exec_is_maker[head] = data.is_maker
+        self._exec_head = (head + 1) % self._exec_cap
+        self._exec_count = min(self._exec_count + 1, self._exec_cap)
+        
+        self._exec_rows.append(data.as_dict())
+        if len(self._exec_rows) >= self.chunk_size:
+            self._flush_executions()
+
         self.stats['executions'] += 1
         
         # Log executions
-        side = "BUY" if data['side'] == 1 else "SELL"
-        symbol = data['symbol']
-        qty = data['qty']
-        price = data['price']
-        fee = data['exec_fee']
+        self._log_q.put(("execution", data))
         
-        print(f"\n💹 Execution: {symbol} {side} {qty} @ ${price:.2f}")
-        print(f"   Exec ID: {data['exec_id']}")
-        print(f"   Fee: ${fee:.4f} ({'Maker' if data['is_maker'] else 'Taker'})")
-        print(f"   Time: {data['exec_time']}")
+    def recent_executions_df(self) -> pl.DataFrame:
+        """Get the recent fills, oldest first, as a Polars DataFrame."""
+        n = self._exec_count
+        # Once the buffer has wrapped, the oldest fill sits at the write head
+        order = np.arange(n)
+        if n == self._exec_cap:
+            order = (order + self._exec_head) % self._exec_cap
+        return pl.DataFrame({
+            "symbol": [self._exec_symbol[i] for i in order.tolist()],
+            "side": self._exec_side[order],
+            "price": self._exec_price[order],
+            "qty": self._exec_qty[order],
+            "exec_fee": self._exec_fee[order],
+            "is_maker": self._exec_is_maker[order],
+        })
         
+    def _flush_executions(self):
+        """Write buffered executions to the Parquet file."""
+        if not self._exec_rows:
+            return
+        if self._exec_writer is None:
+            self._exec_writer = pq.ParquetWriter(self.executions_path, EXECUTION_SCHEMA)
+        table = pa.Table.from_pylist(self._exec_rows, schema=EXECUTION_SCHEMA)
+        self._exec_writer.write_table(table)
+        self._exec_rows.clear()
+        
+    def close(self):
+        """Drain the log queue, flush remaining executions and close the Parquet file."""
+        if self._log_thread.is_alive():
+            self._log_q.put((None, None))
+            self._log_thread.join()
+        self._flush_executions()
+        if self._exec_writer is not None:
+            self._exec_writer.close()
+            self._exec_writer = None
+            
     def on_wallet(self, data):
         """Handle wallet balance updates."""
-        coin = data['coin']
+        coin = data.coin
         self.wallet_balances[coin] = data
         self.stats['wallet_updates'] += 1
         
         # Log significant balance changes
-        print(f"\n💰 Wallet Update: {coin}")
-        print(f"   Balance: {data['wallet_balance']:.4f}")
-        print(f"   Available: {data['available_balance']:.4f}")
-        print(f"   Unrealized P&L: ${data['unrealized_pnl']:.2f}")
-        print(f"   Total Realized P&L: ${data['cum_realized_pnl']:.2f}")
+        self._log_q.put(("wallet", data))
+        
+    def _log_worker(self):
+        """Format queued updates and write them to stdout until stopped."""
+        formatters = {
+            "position": self._format_position,
+            "order": self._format_order,
+            "execution": self._format_execution,
+            "wallet": self._format_wallet,
+        }
+        while True:
+            kind, data = self._log_q.get()
+            if kind is None:
+                break
+            try:
+                text = formatters[kind](data)
+            except Exception as e:
+                # Keep the printer alive on malformed updates
+                text = f"\n⚠️  Could not format {kind} update: {e}\n"
+            if text:
+                sys.stdout.write(text)
+                sys.stdout.flush()
+                
+    @staticmethod
+    def _format_position(data):
+        """Format a position update."""
+        side = "LONG" if data.side == 1 else "SHORT"
+        text = (
+            f"\n📊 Position Update: {data.symbol}\n"
+            f"   Side: {side}, Size: {data.size}\n"
+            f"   Entry: ${data.entry_price:.2f}, Mark: ${data.mark_price:.2f}\n"
+            f"   Unrealized P&L: ${data.unrealized_pnl:.2f}\n"
+        )
+        if data.liq_price:
+            text += f"   Liquidation Price: ${data.liq_price:.2f}\n"
+        return text
+        
+    @staticmethod
+    def _format_order(data):
+        """Format an order status change."""
+        status = data.order_status
+        side = "BUY" if data.side == 1 else "SELL"
+        symbol = data.symbol
+        qty = data.qty
+        price = data.price
+        
+        if status == 'New':
+            return (
+                f"\n📋 New Order: {symbol} {side} {qty} @ ${price:.2f}\n"
+                f"   Order ID: {data.order_id}\n"
+                f"   Type: {data.order_type}\n"
+            )
+        elif status == 'Filled':
+            return (
+                f"\n✅ Order Filled: {symbol} {side} {qty}\n"
+                f"   Avg Price: ${data.cum_exec_value / data.cum_exec_qty:.2f}\n"
+                f"   Fees: ${data.cum_exec_fee:.4f}\n"
+            )
+        elif status == 'Cancelled':
+            return f"\n❌ Order Cancelled: {symbol} {side} {qty} @ ${price:.2f}\n"
+        elif status == 'Rejected':
+            return f"\n🚫 Order Rejected: {symbol} {side} {qty} @ ${price:.2f}\n"
+        return ""
+        
+    @staticmethod
+    def _format_execution(data):
+        """Format an execution."""
+        side = "BUY" if data.side == 1 else "SELL"
+        return (
+            f"\n💹 Execution: {data.symbol} {side} {data.qty} @ ${data.price:.2f}\n"
+            f"   Exec ID: {data.exec_id}\n"
+            f"   Fee: ${data.exec_fee:.4f} ({'Maker' if data.is_maker else 'Taker'})\n"
+            f"   Time: {data.exec_time}\n"
+        )
+        
+    @staticmethod
+    def _format_wallet(data):
+        """Format a wallet balance update."""
+        return (
+            f"\n💰 Wallet Update: {data.coin}\n"
+            f"   Balance: {data.wallet_balance:.4f}\n"
+            f"   Available: {data.available_balance:.4f}\n"
+            f"   Unrealized P&L: ${data.unrealized_pnl:.2f}\n"
+            f"   Total Realized P&L: ${data.cum_realized_pnl:.2f}\n"
+        )
         
     def print_summary(self):
         """Print account summary."""
@@ -131,13 +279,13 @@ class AccountMonitor:
         print("\n📊 Active Positions:")
         total_unrealized_pnl = 0
         for symbol, pos in self.positions.items():
-            if pos['size'] > 0:
-                side = "LONG" if pos['side'] == 1 else "SHORT"
-                print(f"   {symbol}: {side} {pos['size']} @ ${pos['entry_price']:.2f}")
-                print(f"      Unrealized P&L: ${pos['unrealized_pnl']:.2f}")
-                total_unrealized_pnl += pos['unrealized_pnl']
+            if pos.size > 0:
+                side = "LONG" if pos.side == 1 else "SHORT"
+                print(f"   {symbol}: {side} {pos.size} @ ${pos.entry_price:.2f}")
+                print(f"      Unrealized P&L: ${pos.unrealized_pnl:.2f}")
+                total_unrealized_pnl += pos.unrealized_pnl
         
-        if not any(p['size'] > 0 for p in self.positions.values()):
+        if not any(p.size > 0 for p in self.positions.values()):
             print("   No active positions")
         else:
             print(f"\n   Total Unrealized P&L: ${total_unrealized_pnl:.2f}")
@@ -145,15 +293,15 @@ class AccountMonitor:
         # Active orders
         print(f"\n📋 Active Orders: {len(self.active_orders)}")
         for order_id, order in list(self.active_orders.items())[:5]:
-            side = "BUY" if order['side'] == 1 else "SELL"
-            print(f"   {order['symbol']}: {side} {order['qty']} @ ${order['price']:.2f}")
+            side = "BUY" if order.side == 1 else "SELL"
+            print(f"   {order.symbol}: {side} {order.qty} @ ${order.price:.2f}")
             
         # Wallet balances
         print("\n💰 Wallet Balances:")
         for coin, wallet in self.wallet_balances.items():
-            if wallet['wallet_balance'] > 0:
-                print(f"   {coin}: {wallet['wallet_balance']:.4f}")
-                print(f"      Available: {wallet['available_balance']:.4f}")
+            if wallet.wallet_balance > 0:
+                print(f"   {coin}: {wallet.wallet_balance:.4f}")
+                print(f"      Available: {wallet.available_balance:.4f}")
                 
         # Statistics
         print(f"\n📈 Stream Statistics ({elapsed:.1f}s):")
@@ -163,13 +311,16 @@ class AccountMonitor:
         print(f"   Wallet updates: {self.stats['wallet_updates']}")
         
         # Recent executions summary
-        if self.recent_executions:
-            print(f"\n💹 Recent Executions: {len(self.recent_executions)}")
+        if self._exec_count:
+            print(f"\n💹 Recent Executions: {self._exec_count}")
             
             # Calculate volume by side
-            buy_volume = sum(e['qty'] for e in self.recent_executions if e['side'] == 1)
-            sell_volume = sum(e['qty'] for e in self.recent_executions if e['side'] == -1)
-            total_fees = sum(e['exec_fee'] for e in self.recent_executions)
+            n = self._exec_count
+            side = self._exec_side[:n]
+            qty = self._exec_qty[:n]
+            buy_volume = qty[side == 1].sum()
+            sell_volume = qty[side == -1].sum()
+            total_fees = self._exec_fee[:n].sum()
             
             print(f"   Buy volume: {buy_volume:.4f}")
             print(f"   Sell volume: {sell_volume:.4f}")
@@ -215,17 +366,16 @@ async def main():
     except KeyboardInterrupt:
         print("\n\n🛑 Stopping monitor...")
     finally:
-        # Final summary
-        monitor.print_summary()
-        
         # Clean up
         stream.stop()
+        monitor.close()
+        
+        # Final summary
+        monitor.print_summary()
         
-        # Save recent executions for analysis
-        if monitor.recent_executions:
-            df = pl.DataFrame(monitor.recent_executions)
-            df.write_parquet("recent_executions.parquet")
-            print("\n💾 Recent executions saved to recent_executions.parquet")
+        # Executions streamed to disk for analysis
+        if monitor.stats['executions']:
+            print(f"\n💾 Executions saved to {monitor.executions_path}")
 
 
 if __name__ == "__main__":
@@ -12,31 +12,78 @@ Note: For USDT perpetuals (like BTCUSDT), supported orderbook depths are: 1, 50,
 """
 
 import asyncio
+import math
+import queue
 import time
-from collections import deque
+from collections import defaultdict, deque
 
 import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 from dspy.api.bybit.websocket_stream import BybitWebSocketStream
 
+# Column types of the rows streamed to Parquet
+ORDERBOOK_SCHEMA = pa.schema([
+    ("ts", pa.int64()),
+    ("symbol", pa.string()),
+    ("mid", pa.float64()),
+    ("spread", pa.float64()),
+    ("spread_bps", pa.float64()),
+    ("best_bid", pa.float64()),
+    ("best_ask", pa.float64()),
+    ("bid_size", pa.float64()),
+    ("ask_size", pa.float64()),
+    ("update_id", pa.int64()),
+])
+TRADES_SCHEMA = pa.schema([
+    ("ts", pa.int64()),
+    ("symbol", pa.string()),
+    ("price", pa.float64()),
+    ("vol", pa.float64()),
+    ("side", pa.int8()),
+    ("trade_id", pa.string()),
+])
+
 
 class StreamDataCollector:
     """Collects streaming data into Polars DataFrames for analysis."""
     
-    def __init__(self, max_rows=10000):
+    def __init__(
+        self,
+        max_rows=10000,
+        orderbook_path="orderbook_stream.parquet",
+        trades_path="trades_stream.parquet",
+        chunk_size=1024,
+    ):
         """
         Initialize data collector.
         
         Args:
             max_rows: Maximum rows to keep in memory (FIFO)
+            orderbook_path: Parquet file that order book updates are streamed to
+            trades_path: Parquet file that trades are streamed to
+            chunk_size: Number of rows buffered before each write
         """
         self.max_rows = max_rows
+        self.chunk_size = chunk_size
         
         # Use deques for efficient append/pop operations
         self.orderbook_updates = deque(maxlen=max_rows)
         self.trades = deque(maxlen=max_rows)
         self.tickers = deque(maxlen=max_rows)
         
+        # Running buy/sell volume over the trades currently in the buffer
+        self._buy_vol = 0.0
+        self._sell_vol = 0.0
+        
+        # Rows pending a write and the Parquet writer for each stream; writers
+        # open on their first flush
+        self._sinks = {
+            "orderbook": {"path": orderbook_path, "schema": ORDERBOOK_SCHEMA, "rows": [], "writer": None},
+            "trades": {"path": trades_path, "schema": TRADES_SCHEMA, "rows": [], "writer": None},
+        }
+        
         # Track statistics
         self.stats = {
             "orderbook_count": 0,
@@ -45,11 +92,26 @@ class StreamDataCollector:
             "start_time": time.time(),
         }
         
+        # Running per-symbol order book and trade statistics for the session
+        self._ob_stats = defaultdict(lambda: {
+            "mid_sum": 0.0,
+            "n": 0,
+            "spread_sum": 0.0,
+            "spread_min": math.inf,
+            "spread_max": -math.inf,
+        })
+        self._trade_stats = defaultdict(lambda: {"pv_sum": 0.0, "vol": 0.0, "buy_vol": 0.0})
+        
+        # Messages queued by the WebSocket threads until the event loop drains them
+        self._inbox = queue.SimpleQueue()
+        
     def on_orderbook(self, data):
         """Handle order book updates."""
         # Calculate mid price and spread
-        best_bid = data['bids'][0][0] if data['bids'] else None
-        best_ask = data['asks'][0][0] if data['asks'] else None
+        bids = data.bids
+        asks = data.asks
+        best_bid, bid_size = bids[0].tolist() if len(bids) else (None, None)
+        best_ask, ask_size = asks[0].tolist() if len(asks) else (None, None)
         
         if best_bid and best_ask:
             mid_price = (best_bid + best_ask) / 2
@@ -60,19 +122,30 @@ class StreamDataCollector:
             
         # Add derived metrics to the update
         update = {
-            "ts": data['timestamp'],
-            "symbol": data['symbol'],
+            "ts": data.timestamp,
+            "symbol": data.symbol,
             "mid": mid_price,
             "spread": spread,
             "spread_bps": spread_bps,
             "best_bid": best_bid,
             "best_ask": best_ask,
-            "bid_size": data['bids'][0][1] if data['bids'] else None,
-            "ask_size": data['asks'][0][1] if data['asks'] else None,
-            "update_id": data['update_id'],
+            "bid_size": bid_size,
+            "ask_size": ask_size,
+            "update_id": data.update_id,
         }
         
+        if mid_price is not None:
+            ob = self._ob_stats[data.symbol]
+            ob["mid_sum"] += mid_price
+            ob["n"] += 1
+            ob["spread_sum"] += spread_bps
+            if spread_bps < ob["spread_min"]:
+                ob["spread_min"] = spread_bps
+            if spread_bps > ob["spread_max"]:
+                ob["spread_max"] = spread_bps
+        
         self.orderbook_updates.append(update)
+        self._buffer_row("orderbook", update)
         self.stats["orderbook_count"] += 1
         
         # Print periodic updates
@@ -83,34 +156,141 @@ class StreamDataCollector:
         """Handle trade updates."""
         # Add timestamp in nanoseconds for consistency with historical data
         trade = {
-            "ts": data['timestamp'],
-            "symbol": data['symbol'],
-            "price": data['price'],
-            "vol": data['vol'],
-            "side": data['side'],  # Already 1 or -1
-            "trade_id": data['trade_id'],
+            "ts": data.timestamp,
+            "symbol": data.symbol,
+            "price": data.price,
+            "vol": data.vol,
+            "side": data.side,  # Already 1 or -1
+            "trade_id": data.trade_id,
         }
         
+        # The deque drops its oldest trade on append once full
+        if len(self.trades) == self.max_rows:
+            evicted = self.trades[0]
+            if evicted['side'] == 1:
+                self._buy_vol -= evicted['vol']
+            else:
+                self._sell_vol -= evicted['vol']
+        if trade['side'] == 1:
+            self._buy_vol += trade['vol']
+        else:
+            self._sell_vol += trade['vol']
+        
+        ts = self._trade_stats[trade['symbol']]
+        ts["pv_sum"] += trade['price'] * trade['vol']
+        ts["vol"] += trade['vol']
+        if trade['side'] == 1:
+            ts["buy_vol"] += trade['vol']
+        
         self.trades.append(trade)
+        self._buffer_row("trades", trade)
         self.stats["trade_count"] += 1
         
     def on_ticker(self, data):
         """Handle ticker updates."""
         ticker = {
-            "ts": data['timestamp'],
-            "symbol": data['symbol'],
-            "last": data['last_price'],
-            "bid": data['bid_price'],
-            "ask": data['ask_price'],
-            "bid_size": data['bid_size'],
-            "ask_size": data['ask_size'],
-            "volume_24h": data['volume_24h'],
-            "change_24h_pct": data['price_24h_change'],
+            "ts": data.timestamp,
+            "symbol": data.symbol,
+            "last": data.last_price,
+            "bid": data.bid_price,
+            "ask": data.ask_price,
+            "bid_size": data.bid_size,
+            "ask_size": data.ask_size,
+            "volume_24h": data.volume_24h,
+            "change_24h_pct": data.price_24h_change,
         }
         
         self.tickers.append(ticker)
         self.stats["ticker_count"] += 1
         
+    def on_orderbook_batch(self, batch):
+        """Handle a batch of order book updates."""
+        on_orderbook = self.on_orderbook
+        for data in batch:
+            on_orderbook(data)
+            
+    def on_trade_batch(self, batch):
+        """Handle a batch of trade updates."""
+        on_trade = self.on_trade
+        for data in batch:
+            on_trade(data)
+            
+    def on_ticker_batch(self, batch):
+        """Handle a batch of ticker updates."""
+        on_ticker = self.on_ticker
+        for data in batch:
+            on_ticker(data)
+            
+    def enqueue(self, kind):
+        """
+        Get a WebSocket callback that queues messages for drain().
+        
+        Args:
+            kind: One of "orderbook", "trade" or "ticker"
+        """
+        put = self._inbox.put
+        
+        def callback(data):
+            put((kind, data))
+            
+        return callback
+        
+    def drain(self):
+        """
+        Dispatch all queued messages with one batch call per kind.
+        
+        Returns:
+            Number of messages dispatched
+        """
+        batches = {"orderbook": [], "trade": [], "ticker": []}
+        get = self._inbox.get_nowait
+        while True:
+            try:
+                kind, data = get()
+            except queue.Empty:
+                break
+            batches[kind].append(data)
+            
+        if batches["orderbook"]:
+            self.on_orderbook_batch(batches["orderbook"])
+        if batches["trade"]:
+            self.on_trade_batch(batches["trade"])
+        if batches["ticker"]:
+            self.on_ticker_batch(batches["ticker"])
+        return sum(len(batch) for batch in batches.values())
+        
+    def _buffer_row(self, stream, row):
+        """Buffer a row for a stream and write the chunk once it is full."""
+        rows = self._sinks[stream]["rows"]
+        rows.append(row)
+        if len(rows) >= self.chunk_size:
+            self._flush(stream)
+            
+    def _flush(self, stream):
+        """Write buffered rows of a stream to its Parquet file."""
+        sink = self._sinks[stream]
+        if not sink["rows"]:
+            return
+        if sink["writer"] is None:
+            sink["writer"] = pq.ParquetWriter(sink["path"], sink["schema"])
+        sink["writer"].write_table(pa.Table.from_pylist(sink["rows"], schema=sink["schema"]))
+        sink["rows"].clear()
+        
+    def close(self):
+        """Flush remaining rows and close the Parquet files.
+        
+        Returns:
+            Paths of the files that were written
+        """
+        written = []
+        for stream, sink in self._sinks.items():
+            self._flush(stream)
+            if sink["writer"] is not None:
+                sink["writer"].close()
+                sink["writer"] = None
+                written.append(sink["path"])
+        return written
+        
     def get_orderbook_df(self) -> pl.DataFrame:
         """Get order book updates as Polars DataFrame."""
         if not self.orderbook_updates:
@@ -145,15 +325,12 @@ class StreamDataCollector:
             print(f"  Spread: {latest['spread_bps']:.2f} bps")
             
         if self.trades:
-            # Calculate trade statistics
-            trades_df = self.get_trades_df()
-            if len(trades_df) > 0:
-                buy_vol = trades_df.filter(pl.col("side") == 1)["vol"].sum()
-                sell_vol = trades_df.filter(pl.col("side") == -1)["vol"].sum()
-                print("\nRecent trade flow:")
-                print(f"  Buy volume: {buy_vol:.4f}")
-                print(f"  Sell volume: {sell_vol:.4f}")
-                print(f"  Net flow: {buy_vol - sell_vol:.4f}")
+            buy_vol = self._buy_vol
+            sell_vol = self._sell_vol
+            print("\nRecent trade flow:")
+            print(f"  Buy volume: {buy_vol:.4f}")
+            print(f"  Sell volume: {sell_vol:.4f}")
+            print(f"  Net flow: {buy_vol - sell_vol:.4f}")
 
 
 async def main():
@@ -169,48 +346,50 @@ async def main():
     
     for symbol in symbols:
         print(f"Subscribing to {symbol} streams...")
-        stream.subscribe_orderbook(symbol, depth=50, callback=collector.on_orderbook)
-        stream.subscribe_trades(symbol, callback=collector.on_trade)
-        stream.subscribe_ticker(symbol, callback=collector.on_ticker)
+        # The WebSocket threads only queue messages; the loop below processes them
+        stream.subscribe_orderbook(symbol, depth=50, callback=collector.enqueue("orderbook"))
+        stream.subscribe_trades(symbol, callback=collector.enqueue("trade"))
+        stream.subscribe_ticker(symbol, callback=collector.enqueue("ticker"))
     
     # Start streaming
     stream.start()
     print("\nStreaming started. Press Ctrl+C to stop.\n")
     
     try:
-        # Run for a while
-        await asyncio.sleep(60)  # Stream for 60 seconds
+        # Run for a while, draining queued messages in batches
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + 60  # Stream for 60 seconds
+        while loop.time() < deadline:
+            await asyncio.sleep(0.01)
+            collector.drain()
         
         # Analyze collected data
         print("\n\n=== Final Analysis ===")
         
-        # Order book analysis
-        orderbook_df = collector.get_orderbook_df()
-        if len(orderbook_df) > 0:
-            print(f"\nOrder book data: {len(orderbook_df)} updates")
+        # Order book analysis from the running per-symbol statistics
+        if collector.stats["orderbook_count"] > 0:
+            print(f"\nOrder book data: {collector.stats['orderbook_count']} updates")
             
-            # Group by symbol
             for symbol in symbols:
-                symbol_data = orderbook_df.filter(pl.col("symbol") == symbol)
-                if len(symbol_data) > 0:
+                ob = collector._ob_stats.get(symbol)
+                if ob:
                     print(f"\n{symbol} statistics:")
-                    print(f"  Average mid price: {symbol_data['mid'].mean():.2f}")
-                    print(f"  Average spread: {symbol_data['spread_bps'].mean():.2f} bps")
-                    print(f"  Min spread: {symbol_data['spread_bps'].min():.2f} bps")
-                    print(f"  Max spread: {symbol_data['spread_bps'].max():.2f} bps")
+                    print(f"  Average mid price: {ob['mid_sum'] / ob['n']:.2f}")
+                    print(f"  Average spread: {ob['spread_sum'] / ob['n']:.2f} bps")
+                    print(f"  Min spread: {ob['spread_min']:.2f} bps")
+                    print(f"  Max spread: {ob['spread_max']:.2f} bps")
         
         # Trade analysis
-        trades_df = collector.get_trades_df()
-        if len(trades_df) > 0:
-            print(f"\nTrade data: {len(trades_df)} trades")
+        if collector.stats["trade_count"] > 0:
+            print(f"\nTrade data: {collector.stats['trade_count']} trades")
             
             # VWAP calculation
             for symbol in symbols:
-                symbol_trades = trades_df.filter(pl.col("symbol") == symbol)
-                if len(symbol_trades) > 0:
-                    vwap = (symbol_trades["price"] * symbol_trades["vol"]).sum() / symbol_trades["vol"].sum()
-                    total_vol = symbol_trades["vol"].sum()
-                    buy_ratio = symbol_trades.filter(pl.col("side") == 1)["vol"].sum() / total_vol
+                ts = collector._trade_stats.get(symbol)
+                if ts and ts["vol"] > 0:
+                    vwap = ts["pv_sum"] / ts["vol"]
+                    total_vol = ts["vol"]
+                    buy_ratio = ts["buy_vol"] / total_vol
                     
                     print(f"\n{symbol} trade statistics:")
                     print(f"  VWAP: {vwap:.2f}")
@@ -222,15 +401,11 @@ async def main():
     finally:
         # Clean up
         stream.stop()
+        collector.drain()
         
-        # Save data to files for further analysis
-        if len(collector.get_orderbook_df()) > 0:
-            collector.get_orderbook_df().write_parquet("orderbook_stream.parquet")
-            print("Order book data saved to orderbook_stream.parquet")
-            
-        if len(collector.get_trades_df()) > 0:
-            collector.get_trades_df().write_parquet("trades_stream.parquet")
-            print("Trade data saved to trades_stream.parquet")
+        # Flush data streamed to disk for further analysis
+        for path in collector.close():
+            print(f"Data saved to {path}")
 
 
 if __name__ == "__main__":
@@ -1,7 +1,47 @@
-from dotenv import load_dotenv
+import importlib
+import os
+
+# Registers the `ds` DataFrame namespace that the data loaders rely on
 from dspy.features import polars_extensions
 
-# Load environment variables from .env file automatically
-load_dotenv()
+_DOTENV_LOADED = False
+
+
+def bootstrap():
+    """Load environment variables from a .env file, at most once per interpreter."""
+    global _DOTENV_LOADED
+    if _DOTENV_LOADED:
+        return
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    _DOTENV_LOADED = True
+
+
+# Load environment variables from .env file automatically, unless disabled with
+# DSPY_AUTOLOAD_DOTENV=0 (then call dspy.bootstrap() explicitly)
+if os.environ.get("DSPY_AUTOLOAD_DOTENV", "1") == "1":
+    bootstrap()
+
+# Submodules imported on first attribute access (PEP 562) so that `import dspy`
+# does not pull in pybit and the rest of the package up front
+_LAZY_SUBMODULES = {
+    "api": "dspy.api",
+    "features": "dspy.features",
+    "hdb": "dspy.hdb",
+    "sim": "dspy.sim",
+    "utils": "dspy.utils",
+    "time": "dspy.utils.time",
+    "positions": "dspy.sim.positions",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_SUBMODULES:
+        module = importlib.import_module(_LAZY_SUBMODULES[name])
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-__all__ = ["polars_extensions", "time", "positions"]
+__all__ = ["polars_extensions", "time", "positions", "bootstrap"]
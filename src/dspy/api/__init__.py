@@ -1,7 +1,24 @@
+import importlib
+
 from .api_registry import register_api, get_api, API_REGISTRY
 from .base import Exchange
-from .bybit.bybit_api import ByBitManager
-from .bybit.config import Config
+
+# Bybit classes are imported on first access so that using the registry or the
+# simulator does not load pybit
+_LAZY_ATTRS = {
+    "ByBitManager": ".bybit.bybit_api",
+    "Config": ".bybit.config",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        module = importlib.import_module(_LAZY_ATTRS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "register_api",
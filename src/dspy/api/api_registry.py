@@ -2,11 +2,18 @@
 Registry for APIs.
 """
 
+import importlib
 from typing import Type
 from dspy.api.base import Exchange
 
 API_REGISTRY: dict[str, Type[Exchange]] = {}
 
+# Modules that register the built-in APIs, imported on first use by get_api
+_BUILTIN_APIS = {
+    "bybit": "dspy.api.bybit.bybit_api",
+    "simulation": "dspy.sim.simulation_engine",
+}
+
 
 def register_api(name):
     """
@@ -40,6 +47,9 @@ def get_api(name, **kwargs):
     Raises:
         ValueError: If the API name is not found in the registry.
     """
+    if name not in API_REGISTRY and name in _BUILTIN_APIS:
+        importlib.import_module(_BUILTIN_APIS[name])
+
     if name not in API_REGISTRY:
         available = list(API_REGISTRY.keys())
         raise ValueError(f"API '{name}' is not registered. Available APIs: {available}")
@@ -4,6 +4,10 @@ A simple interface for interacting with exchanges.
 
 import time
 import logging
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
 
 logger = logging.getLogger("DS.exchanges")
 
@@ -29,6 +33,21 @@ class Exchange:
         """
         raise NotImplementedError("get_mid not implemented")
 
+    def get_mids(self, symbols: list[str]) -> "np.ndarray":
+        """
+        Return best mid prices for a list of products.
+
+        Arguments:
+            symbols -- the list of product symbols
+        """
+        import numpy as np
+
+        return np.fromiter(
+            (self.get_mid(symbol) for symbol in symbols),
+            dtype=np.float64,
+            count=len(symbols),
+        )
+
     def get_ask(self, _symbol: str, _depth: int = 1) -> list[float]:
         """
         Return best ask price and volume.
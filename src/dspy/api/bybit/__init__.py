@@ -1,5 +1,21 @@
-from .bybit_api import ByBitManager
-from .config import Config
-from .websocket_stream import BybitWebSocketStream
+import importlib
+
+# Exported names and the submodule defining each; imported on first access so
+# that importing the package does not load pybit until a class is used
+_LAZY_ATTRS = {
+    "ByBitManager": "bybit_api",
+    "Config": "config",
+    "BybitWebSocketStream": "websocket_stream",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        module = importlib.import_module(f".{_LAZY_ATTRS[name]}", __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ["ByBitManager", "Config", "BybitWebSocketStream"]
@@ -0,0 +1,29 @@
+"""
+Optional orjson support shared by the Bybit REST and WebSocket clients.
+"""
+
+import json
+import types
+
+from pybit import _websocket_stream as _pybit_websocket_stream
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Decoder for JSON text or bytes, orjson's if it is installed
+json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def install_websocket_decoder() -> None:
+    """
+    Make pybit's WebSocket streams decode frames with orjson, if it is installed.
+
+    pybit decodes every frame with its module-level json.loads; outgoing
+    messages keep the stdlib encoder. Calling this more than once is harmless.
+    """
+    if orjson is not None:
+        _pybit_websocket_stream.json = types.SimpleNamespace(
+            loads=orjson.loads, dumps=json.dumps
+        )
@@ -1,21 +1,232 @@
 """
 This module provides a simple interface to the pybit library functions.
+
+If orjson is installed (``pip install dspy[json]``), responses and WebSocket
+messages are decoded with it instead of the stdlib json module, and REST request
+bodies are encoded with it on pybit releases that sign bytes bodies.
 """
 
+import json
 import logging
+import threading
 import time
+import types
+from collections import deque, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import TYPE_CHECKING
 
-import numpy as np
+import polars as pl
 import pybit.unified_trading as bb
+from pybit import _http_manager as _pybit_http_manager
+from requests.adapters import HTTPAdapter
 
 from dspy.api.api_registry import register_api
 from dspy.api.base import Exchange
 
 # Local imports
+from dspy.api.bybit._orjson import install_websocket_decoder, orjson
 from dspy.api.bybit.config import Config
+from dspy.api.bybit.signer import HmacSigner
+
+# The local book module brings in numpy, which is imported on first market
+# data use rather than with this module
+if TYPE_CHECKING:
+    from dspy.api.bybit.local_book import LocalBook
 
 logger = logging.getLogger("DS.exchanges")
 
+# pybit encodes request bodies with its module-level json.dumps; orjson returns
+# bytes, which pybit signs and sends as they are only in releases that sign bytes
+# bodies with _auth_binary. Older ones would add bytes to the str being signed
+if orjson is not None and hasattr(_pybit_http_manager._V5HTTPManager, "_auth_binary"):
+    _pybit_http_manager.json = types.SimpleNamespace(
+        dumps=partial(orjson.dumps, option=orjson.OPT_SERIALIZE_NUMPY),
+        loads=json.loads,
+    )
+# The order book and account streams are decoded by pybit's WebSocket module
+install_websocket_decoder()
+
+
+def _orjson_response(response, *args, **kwargs):
+    """Response hook making response.json() decode with orjson."""
+    content = response.content
+    response.json = lambda **kwargs: orjson.loads(content)
+    return response
+
+# Keep-alive connections held per host by the HTTP session; pybit retries
+# failed requests itself, so the adapter does not
+HTTP_POOL_CONNECTIONS = 32
+HTTP_POOL_MAXSIZE = 64
+
+# Worker threads submitting orders concurrently for the *_async methods
+ORDER_WORKERS = 8
+
+# Seconds for which fee rates and the wallet balance are served from cache;
+# fee rates change a few times a day, the balance cache only coalesces bursts
+FEE_TTL = 300.0
+BALANCE_TTL = 0.1
+
+# Most orders the batch endpoints accept per request for linear products
+BATCH_ORDER_LIMIT = 20
+
+# Executions kept from the private stream for get_trade_history
+EXECUTION_HISTORY = 1000
+
+# Deepest book the REST API returns for linear products
+MAX_BOOK_DEPTH = 500
+
+# Order book as one array per side and field
+OrderBookView = namedtuple(
+    "OrderBookView", ("bid_px", "bid_qty", "ask_px", "ask_qty", "ts", "cts")
+)
+
+# Sign of a trade or position by side
+SIDE_SIGN = {"Buy": 1, "Sell": -1}
+
+# Output columns of the record endpoints: name -> (API key, dtype, default).
+# A default of None marks a key the API always sends.
+TRADE_COLUMNS = {
+    "ts": ("time", pl.String, None),
+    "price": ("price", pl.Float64, None),
+    "qty": ("size", pl.Float64, None),
+    "side": ("side", pl.String, None),
+}
+EXECUTION_COLUMNS = {
+    "symbol": ("symbol", pl.String, None),
+    "side": ("side", pl.String, None),
+    "price": ("execPrice", pl.Float64, None),
+    "qty": ("execQty", pl.Float64, None),
+    "exec_type": ("execType", pl.String, None),
+    "exec_value": ("execValue", pl.Float64, None),
+    "exec_fee": ("execFee", pl.Float64, None),
+    "fee_rate": ("feeRate", pl.Float64, "0"),
+    "exec_time": ("execTime", pl.Int64, None),
+    "order_type": ("orderType", pl.String, ""),
+    "order_price": ("orderPrice", pl.Float64, "0"),
+}
+ORDER_COLUMNS = {
+    "order_id": ("orderId", pl.String, None),
+    "order_link_id": ("orderLinkId", pl.String, ""),
+    "symbol": ("symbol", pl.String, None),
+    "side": ("side", pl.String, None),
+    "order_type": ("orderType", pl.String, None),
+    "price": ("price", pl.Float64, None),
+    "qty": ("qty", pl.Float64, None),
+    "avg_price": ("avgPrice", pl.Float64, "0"),
+    "cum_exec_qty": ("cumExecQty", pl.Float64, "0"),
+    "cum_exec_value": ("cumExecValue", pl.Float64, "0"),
+    "cum_exec_fee": ("cumExecFee", pl.Float64, "0"),
+    "order_status": ("orderStatus", pl.String, None),
+    "created_time": ("createdTime", pl.Int64, None),
+    "updated_time": ("updatedTime", pl.Int64, None),
+}
+PNL_COLUMNS = {
+    "symbol": ("symbol", pl.String, None),
+    "side": ("side", pl.String, None),
+    "qty": ("qty", pl.Float64, None),
+    "order_price": ("orderPrice", pl.Float64, "0"),
+    "order_type": ("orderType", pl.String, ""),
+    "exec_type": ("execType", pl.String, ""),
+    "closed_size": ("closedSize", pl.Float64, "0"),
+    "cum_entry_value": ("cumEntryValue", pl.Float64, "0"),
+    "avg_entry_price": ("avgEntryPrice", pl.Float64, "0"),
+    "cum_exit_value": ("cumExitValue", pl.Float64, "0"),
+    "avg_exit_price": ("avgExitPrice", pl.Float64, "0"),
+    "closed_pnl": ("closedPnl", pl.Float64, "0"),
+    "fill_count": ("fillCount", pl.Int64, "0"),
+    "leverage": ("leverage", pl.Float64, "0"),
+    "created_time": ("createdTime", pl.Int64, None),
+    "updated_time": ("updatedTime", pl.Int64, None),
+}
+
+
+@dataclass(slots=True, frozen=True)
+class Execution:
+    """An execution kept in memory, a fraction of the size of the API record."""
+
+    symbol: str
+    side: str
+    price: float
+    qty: float
+    exec_type: str
+    exec_value: float
+    exec_fee: float
+    fee_rate: float
+    exec_time: int
+    order_type: str
+    order_price: float
+
+    @classmethod
+    def from_record(cls, e: dict) -> "Execution":
+        """
+        Convert an execution record from the REST API or the private stream.
+
+        Arguments:
+            e -- the execution record
+        """
+        return cls(
+            e["symbol"],
+            e["side"],
+            float(e["execPrice"]),
+            float(e["execQty"]),
+            e["execType"],
+            float(e["execValue"]),
+            float(e["execFee"]),
+            float(e.get("feeRate", 0)),
+            int(e["execTime"]),
+            e.get("orderType", ""),
+            float(e.get("orderPrice", 0)),
+        )
+
+    def as_dict(self) -> dict:
+        """Return the execution as returned by get_trade_history."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def format_units(units: int, decimals: int) -> str:
+    """
+    Format an integer count of 10**-decimals as a decimal string.
+
+    Arguments:
+        units -- the non-negative value in units of the last decimal place
+        decimals -- the number of decimal places
+    """
+    if decimals == 0:
+        return str(units)
+    digits = str(units).rjust(decimals + 1, "0")
+    return f"{digits[:-decimals]}.{digits[-decimals:]}"
+
+
+def parse_step(step: str) -> tuple[float, int, int]:
+    """
+    Split a step size from the API into its value, decimal places and units.
+
+    Arguments:
+        step -- the step as a decimal string, e.g. "0.001"
+    """
+    decimals = len(step.partition(".")[2])
+    return float(step), decimals, int(step.replace(".", ""))
+
+
+def records_to_frame(records: list[dict], columns: dict) -> pl.DataFrame:
+    """
+    Build a DataFrame from API records, converting each column in one cast.
+
+    Arguments:
+        records -- records as returned by the API, with numbers as strings
+        columns -- output name -> (API key, dtype, default)
+    """
+    data = {}
+    for name, (key, dtype, default) in columns.items():
+        if default is None:
+            values = [r[key] for r in records]
+        else:
+            values = [r.get(key, default) for r in records]
+        data[name] = pl.Series(name, values, dtype=pl.String).cast(dtype)
+    return pl.DataFrame(data)
+
 
 @register_api("bybit")
 class ByBitManager(Exchange):
@@ -23,13 +234,31 @@ class ByBitManager(Exchange):
     Simple interface for interacting with ByBit.
     """
 
-    def __init__(self, config: Config):
+    def __init__(
+        self,
+        config: Config,
+        stream_books: bool = True,
+        book_depth: int = 50,
+        max_book_age: float = 0.5,
+        stream_account: bool = True,
+    ):
         """
         Set up a HTTP connector.
 
+        Order books are streamed over a public WebSocket once a product is first
+        queried; until the local book is ready, or whenever it is older than
+        max_book_age, market data reads fall back to REST. Likewise the wallet
+        balance, positions and executions are taken from the private WebSocket
+        once an account query has started it, with REST only for the initial
+        snapshot.
+
         Arguments:
             config.api_key -- the public API key
             config.api_secret -- the private API key
+            stream_books -- whether to maintain local order books over WebSocket
+            book_depth -- the depth of the streamed order books
+            max_book_age -- the maximum age of a local book in seconds
+            stream_account -- whether to maintain account state over WebSocket
         """
         super().__init__()
         self.s = bb.HTTP(
@@ -37,8 +266,111 @@ class ByBitManager(Exchange):
             api_secret=config.api_secret,
             logging_level=logging.INFO,
         )
+        # pybit sends every request through one requests.Session; widen its
+        # connection pool so bursts of calls reuse open TLS connections
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE
+        )
+        self.s.client.mount("https://", adapter)
+        if orjson is not None:
+            self.s.client.hooks["response"].append(_orjson_response)
+        if config.api_key and config.api_secret:
+            HmacSigner(config.api_key, config.api_secret).install(self.s)
+        # Bind the arguments that never change on the calls made per order
+        self._place = partial(
+            self.s.place_order, category="linear", timeInForce="GTC", isLeverage=True
+        )
+        self._cancel = partial(self.s.cancel_order, category="linear")
+        self._get_positions = partial(self.s.get_positions, category="linear")
+        self.settle_coin = config.coin
+        self._api_key = config.api_key
+        self._api_secret = config.api_secret
+        self.stream_books = stream_books
+        self.book_depth = book_depth
+        self.max_book_age = max_book_age
+        self._books: dict[str, "LocalBook"] = {}
+        self._ws = None
+        # Serialize the lazy start of the streams, which order pool threads can
+        # race to do
+        self._book_lock = threading.Lock()
+        self._account_lock = threading.Lock()
+        self._order_pool = None
+        self._fees: dict[str, tuple[float, list]] = {}  # symbol -> (expiry, fees)
+        self._leverage: dict[str, tuple[int, dict]] = {}  # symbol -> (leverage, resp)
+        self._steps: dict[str, tuple] = {}  # symbol -> qty step, price tick
+        self._balance: tuple[float, float] | None = None  # (expiry, balance)
+
+        # Account state pushed over the private stream
+        self.stream_account = stream_account
+        self._private_ws = None
+        self._wallet_balance: float | None = None
+        self._positions: dict[str, dict] = {}
+        self._executions: deque[Execution] = deque(maxlen=EXECUTION_HISTORY)
+
+        # Bid and ask price and size buffers that get_book_view fills in place,
+        # allocated on first use
+        self._view_buffers = None
 
     # Market
+    def _get_book(self, symbol: str, depth: int = 1) -> "LocalBook | None":
+        """
+        Return the local book for a product if it is fresh, subscribing on first use.
+
+        Arguments:
+            symbol -- the product symbol
+            depth -- the depth the caller needs
+        """
+        if not self.stream_books or depth > self.book_depth:
+            return None
+        book = self._books.get(symbol)
+        if book is None:
+            from dspy.api.bybit.local_book import LocalBook
+
+            with self._book_lock:
+                if symbol in self._books:
+                    return None
+                if self._ws is None:
+                    self._ws = bb.WebSocket(testnet=False, channel_type="linear")
+                book = LocalBook()
+                self._ws.orderbook_stream(
+                    depth=self.book_depth, symbol=symbol, callback=book.apply
+                )
+                self._books[symbol] = book
+            return None
+        return book if book.is_fresh(self.max_book_age) else None
+
+    def close(self):
+        """
+        Stop the WebSocket streams and wait for submitted orders.
+        """
+        if self._ws is not None:
+            self._ws.exit()
+            self._ws = None
+            self._books.clear()
+        if self._private_ws is not None:
+            self._private_ws.exit()
+            self._private_ws = None
+            self._wallet_balance = None
+            self._positions.clear()
+            self._executions.clear()
+        if self._order_pool is not None:
+            self._order_pool.shutdown(wait=True)
+            self._order_pool = None
+
+    def _submit(self, fn, *args, **kwargs) -> Future:
+        """
+        Run a call on the order worker pool, creating the pool on first use.
+
+        Arguments:
+            fn -- the function to call
+            args, kwargs -- the arguments to call it with
+        """
+        if self._order_pool is None:
+            self._order_pool = ThreadPoolExecutor(
+                max_workers=ORDER_WORKERS, thread_name_prefix="bybit-order"
+            )
+        return self._order_pool.submit(fn, *args, **kwargs)
+
     def get_mid(self, symbol: str) -> float:
         """
         Return best mid price.
@@ -46,6 +378,10 @@ class ByBitManager(Exchange):
         Arguments:
             symbol -- the product symbol
         """
+        book = self._get_book(symbol)
+        if book is not None:
+            bid, _, ask, _ = book.top()
+            return (bid + ask) / 2
         last_price = self.s.get_tickers(category="linear", symbol=symbol)["result"][
             "list"
         ][0]["lastPrice"]
@@ -59,11 +395,18 @@ class ByBitManager(Exchange):
             symbol -- the product symbol
             depth -- the depth of the orderbook
         """
+        book = self._get_book(symbol, depth)
+        if book is not None:
+            bids, asks, ts, cts = book.levels(depth)
+            return {"b": bids, "a": asks, "ts": ts, "cts": cts}
+
+        from dspy.api.bybit.local_book import parse_levels
+
         orderbook = self.s.get_orderbook(category="linear", symbol=symbol, limit=depth)[
             "result"
         ]
-        bids = np.array(orderbook["b"], dtype=float)
-        asks = np.array(orderbook["a"], dtype=float)
+        bids = parse_levels(orderbook["b"])
+        asks = parse_levels(orderbook["a"])
         orderbook = {
             "b": bids,
             "a": asks,
@@ -72,6 +415,46 @@ class ByBitManager(Exchange):
         }
         return orderbook
 
+    def get_book_view(self, symbol: str, depth: int = 25) -> OrderBookView:
+        """
+        Return orderbook for product as views into buffers owned by the manager.
+
+        The arrays are overwritten by the next call, so copy them to keep them.
+
+        Arguments:
+            symbol -- the product symbol
+            depth -- the depth of the orderbook
+        """
+        import numpy as np
+
+        from dspy.api.bybit.local_book import parse_levels
+
+        if self._view_buffers is None:
+            self._view_buffers = tuple(
+                np.empty(MAX_BOOK_DEPTH, dtype=np.float64) for _ in range(4)
+            )
+        bid_px, bid_qty, ask_px, ask_qty = self._view_buffers
+
+        depth = min(depth, MAX_BOOK_DEPTH)
+        book = self._get_book(symbol, depth)
+        if book is not None:
+            nb, na, ts, cts = book.copy_into(bid_px, bid_qty, ask_px, ask_qty, depth)
+        else:
+            orderbook = self.s.get_orderbook(
+                category="linear", symbol=symbol, limit=depth
+            )["result"]
+            bids = parse_levels(orderbook["b"])
+            asks = parse_levels(orderbook["a"])
+            nb, na = len(bids), len(asks)
+            bid_px[:nb] = bids[:, 0]
+            bid_qty[:nb] = bids[:, 1]
+            ask_px[:na] = asks[:, 0]
+            ask_qty[:na] = asks[:, 1]
+            ts, cts = orderbook["ts"], orderbook["cts"]
+        return OrderBookView(
+            bid_px[:nb], bid_qty[:nb], ask_px[:na], ask_qty[:na], ts, cts
+        )
+
     def get_ask(self, symbol: str, depth: int = 1) -> list[float]:
         """
         Return best ask price and volume.
@@ -79,8 +462,12 @@ class ByBitManager(Exchange):
         Arguments:
             symbol -- the product symbol
         """
-        ask = self.get_orderbook(symbol, depth=1)["a"][0]
-        return [float(ask[0]), float(ask[1])]
+        book = self._get_book(symbol)
+        if book is not None:
+            _, _, ask_px, ask_qty = book.top()
+            return [ask_px, ask_qty]
+        view = self.get_book_view(symbol, depth=1)
+        return [float(view.ask_px[0]), float(view.ask_qty[0])]
 
     def get_bid(self, symbol: str, depth: int = 1) -> list[float]:
         """
@@ -89,30 +476,31 @@ class ByBitManager(Exchange):
         Arguments:
             symbol -- the product symbol
         """
-        bid = self.get_orderbook(symbol, depth=1)["b"][0]
-        return [float(bid[0]), float(bid[1])]
+        book = self._get_book(symbol)
+        if book is not None:
+            bid_px, bid_qty, _, _ = book.top()
+            return [bid_px, bid_qty]
+        view = self.get_book_view(symbol, depth=1)
+        return [float(view.bid_px[0]), float(view.bid_qty[0])]
 
-    def get_trades(self, symbol: str, limit: int = 100) -> list[float]:
+    def get_trades(
+        self, symbol: str, limit: int = 100, as_frame: bool = False
+    ) -> list[dict] | pl.DataFrame:
         """
         Return trades for product.
 
         Arguments:
             symbol -- the product symbol
             limit -- the number of trades to return
+            as_frame -- return a DataFrame instead of a list of dicts
         """
         trades = self.s.get_public_trade_history(
             category="linear", symbol=symbol, limit=limit
         )["result"]["list"]
-        trades = [
-            {
-                "ts": t["time"],
-                "price": float(t["price"]),
-                "qty": float(t["size"]),
-                "side": 1 if t["side"] == "Buy" else -1,
-            }
-            for t in trades
-        ]
-        return trades
+        trades = records_to_frame(trades, TRADE_COLUMNS).with_columns(
+            side=pl.col("side").replace_strict(SIDE_SIGN, default=-1, return_dtype=pl.Int64)
+        )
+        return trades if as_frame else trades.to_dicts()
 
     def get_latency(self, symbol: str, depth: int = 1) -> float:
         """
@@ -122,6 +510,9 @@ class ByBitManager(Exchange):
             symbol -- the product symbol
             depth -- the depth of the orderbook
         """
+        book = self._get_book(symbol, depth)
+        if book is not None:
+            return book.ts - book.cts
         orderbook = self.s.get_orderbook(
             category="linear",
             symbol=symbol,
@@ -133,77 +524,283 @@ class ByBitManager(Exchange):
     def set_leverage(self, symbol: str, leverage: int) -> dict:
         """
         Set leverage for product.
+
+        The exchange rejects setting the leverage already in place, so repeated
+        calls with the same value return the response of the first one.
         """
+        cached = self._leverage.get(symbol)
+        if cached is not None and cached[0] == leverage:
+            return cached[1]
         resp = self.s.set_leverage(
             category="linear",
             symbol=symbol,
             buyLeverage=leverage,
             sellLeverage=leverage,
         )
+        self._leverage[symbol] = (leverage, resp)
         return resp
 
-    # Account info
-    def get_wallet_balance(self) -> float:
+    # Account stream
+    def _account_stream(self) -> bool:
         """
-        Return wallet balance.
+        Return whether account state is streamed, starting the stream on first use.
 
-        Arguments:
-            symbol -- the product symbol
+        The stream is subscribed before the REST snapshot is taken, so that no
+        update is lost in between; snapshot records never replace pushed ones.
+        """
+        if not self.stream_account:
+            return False
+        if self._private_ws is not None:
+            return True
+        with self._account_lock:
+            if self._private_ws is not None:
+                return True
+            if not self.stream_account:
+                return False
+            try:
+                ws = bb.WebSocket(
+                    testnet=False,
+                    channel_type="private",
+                    api_key=self._api_key,
+                    api_secret=self._api_secret,
+                )
+                ws.wallet_stream(callback=self._on_wallet)
+                ws.position_stream(callback=self._on_position)
+                ws.execution_stream(callback=self._on_execution)
+            except Exception as e:
+                logger.warning(f"Private stream unavailable, polling REST instead: {e}")
+                self.stream_account = False
+                return False
+
+            # The stream is only used once the snapshot is in; if that fails it
+            # is closed and REST answers, and the next call tries again
+            try:
+                self._load_account_snapshot()
+            except Exception as e:
+                logger.warning(f"Account snapshot failed, polling REST instead: {e}")
+                ws.exit()
+                self._wallet_balance = None
+                self._positions.clear()
+                self._executions.clear()
+                return False
+            self._private_ws = ws
+            return True
+
+    def _load_account_snapshot(self):
+        """Fill in account state the private stream has not pushed yet over REST."""
+        if self._wallet_balance is None:
+            self._wallet_balance = self._fetch_wallet_balance()
+        cursor = None
+        while True:
+            params = {"settleCoin": self.settle_coin, "limit": 200}
+            if cursor:
+                params["cursor"] = cursor
+            result = self._get_positions(**params)["result"]
+            for pos in result["list"]:
+                self._positions.setdefault(pos["symbol"], self._parse_position(pos))
+            cursor = result.get("nextPageCursor")
+            if not cursor:
+                break
+        if not self._executions:
+            executions = self.s.get_executions(category="linear", limit=100)
+            self._executions.extend(
+                map(Execution.from_record, reversed(executions["result"]["list"]))
+            )
+
+    def _on_wallet(self, message: dict):
+        """Store the available balance of the unified account."""
+        for account in message["data"]:
+            if account["accountType"] == "UNIFIED":
+                self._wallet_balance = float(account["totalAvailableBalance"])
+
+    def _on_position(self, message: dict):
+        """Store updated linear positions."""
+        for pos in message["data"]:
+            if pos.get("category", "linear") != "linear":
+                continue
+            if "avgPrice" not in pos:
+                # The stream names the average entry price entryPrice
+                pos = {**pos, "avgPrice": pos["entryPrice"]}
+            self._positions[pos["symbol"]] = self._parse_position(pos)
+
+    def _on_execution(self, message: dict):
+        """Append linear executions, oldest first."""
+        self._executions.extend(
+            Execution.from_record(e)
+            for e in message["data"]
+            if e.get("category", "linear") == "linear"
+        )
+
+    # Account info
+    def _fetch_wallet_balance(self) -> float:
+        """
+        Return wallet balance from the REST API.
         """
         wallet_balance = self.s.get_wallet_balance(accountType="UNIFIED")["result"][
             "list"
         ][0]["totalAvailableBalance"]
         return float(wallet_balance)
 
+    def get_wallet_balance(self) -> float:
+        """
+        Return wallet balance.
+        """
+        if self._account_stream():
+            return self._wallet_balance
+        now = time.monotonic()
+        if self._balance is not None and now < self._balance[0]:
+            return self._balance[1]
+        wallet_balance = self._fetch_wallet_balance()
+        self._balance = (now + BALANCE_TTL, wallet_balance)
+        return wallet_balance
+
     def get_fees(self, symbol: str) -> list:
         """Return taker and maker fees for product."""
+        now = time.monotonic()
+        cached = self._fees.get(symbol)
+        if cached is not None and now < cached[0]:
+            return list(cached[1])
         fees = self.s.get_fee_rates(symbol=symbol)["result"]["list"][0]
-        return [float(fees["takerFeeRate"]), float(fees["makerFeeRate"])]
+        fees = [float(fees["takerFeeRate"]), float(fees["makerFeeRate"])]
+        self._fees[symbol] = (now + FEE_TTL, fees)
+        return list(fees)
+
+    def invalidate_balance(self):
+        """
+        Drop the cached wallet balance so the next read goes to the exchange.
+
+        Called when orders are placed; call it on fills seen elsewhere.
+        """
+        self._balance = None
 
     # Position info
+    @staticmethod
+    def _parse_position(pos: dict) -> dict:
+        """
+        Convert a position record from the REST API.
+
+        Arguments:
+            pos -- the position record
+        """
+        if pos["size"] != "0":
+            return {
+                "size": SIDE_SIGN[pos["side"]] * float(pos["size"]),
+                "aep": float(pos["avgPrice"]),
+                "mark_price": float(pos["markPrice"]),
+                "value": float(pos["positionValue"]),
+                "leverage": float(pos["leverage"]),
+                "position_balance": float(pos["positionBalance"]),
+                "unrealized_pnl": float(pos["unrealisedPnl"]),
+                "realized_pnl": float(pos["curRealisedPnl"]),
+            }
+        return {
+            "size": 0,
+            "aep": 0,
+            "mark_price": float(pos["markPrice"]),
+            "value": 0,
+            "leverage": float(pos["leverage"]),
+            "position_balance": 0,
+            "unrealized_pnl": 0,
+            "realized_pnl": float(pos["curRealisedPnl"]),
+        }
+
+    def _get_position(self, symbol: str) -> dict:
+        """
+        Return the position in a single product.
+
+        Arguments:
+            symbol -- the product symbol
+        """
+        pos = self._get_positions(symbol=symbol)["result"]["list"][0]
+        return self._parse_position(pos)
+
     def get_positions(self, symbols: list[str]) -> dict:
         """
         Return positions in product specified by symbol.
 
+        Several products are fetched with one request for all open positions in
+        the settle coin; products without an open position are then queried
+        individually, in parallel, for their mark price and leverage.
+
         Arguments:
             symbol -- the product symbol
         """
-        positions = {}
-        for s in symbols:
-            pos = self.s.get_positions(
-                category="linear",
-                symbol=s,
-            )["result"]["list"][0]
-            sign = 1 if pos["side"] == "Buy" else -1
-            if pos["size"] != "0":
-                p = {
-                    "size": sign * float(pos["size"]),
-                    "aep": float(pos["avgPrice"]),
-                    "mark_price": float(pos["markPrice"]),
-                    "value": float(pos["positionValue"]),
-                    "leverage": float(pos["leverage"]),
-                    "position_balance": float(pos["positionBalance"]),
-                    "unrealized_pnl": float(pos["unrealisedPnl"]),
-                    "realized_pnl": float(pos["curRealisedPnl"]),
-                }
-            else:
-                p = {
-                    "size": 0,
-                    "aep": 0,
-                    "mark_price": float(pos["markPrice"]),
-                    "value": 0,
-                    "leverage": float(pos["leverage"]),
-                    "position_balance": 0,
-                    "unrealized_pnl": 0,
-                    "realized_pnl": float(pos["curRealisedPnl"]),
-                }
-            positions[s] = p
+        if self._account_stream():
+            # Products never traded since startup are not in the stream yet
+            for s in symbols:
+                if s not in self._positions:
+                    self._positions[s] = self._get_position(s)
+            if len(symbols) == 1:
+                return self._positions[symbols[0]]
+            return {s: self._positions[s] for s in symbols}
 
         if len(symbols) == 1:
-            positions = positions[symbols[0]]
-        return positions
+            return self._get_position(symbols[0])
+
+        wanted = set(symbols)
+        positions = {}
+        cursor = None
+        while True:
+            params = {"settleCoin": self.settle_coin, "limit": 200}
+            if cursor:
+                params["cursor"] = cursor
+            result = self._get_positions(**params)["result"]
+            for pos in result["list"]:
+                if pos["symbol"] in wanted:
+                    positions[pos["symbol"]] = self._parse_position(pos)
+            cursor = result.get("nextPageCursor")
+            if not cursor or len(positions) == len(wanted):
+                break
+
+        missing = {
+            s: self._submit(self._get_position, s) for s in symbols if s not in positions
+        }
+        for s, future in missing.items():
+            positions[s] = future.result()
+        return {s: positions[s] for s in symbols}
 
     # Trading
+    def _get_steps(self, symbol: str) -> tuple:
+        """
+        Return the quantity step and price tick of a product, as from parse_step.
+
+        Arguments:
+            symbol -- the product symbol
+        """
+        steps = self._steps.get(symbol)
+        if steps is None:
+            info = self.s.get_instruments_info(category="linear", symbol=symbol)
+            info = info["result"]["list"][0]
+            steps = self._steps[symbol] = (
+                parse_step(info["lotSizeFilter"]["qtyStep"]),
+                parse_step(info["priceFilter"]["tickSize"]),
+            )
+        return steps
+
+    def _format_qty(self, symbol: str, qty: float) -> str:
+        """
+        Return the absolute quantity rounded down to the product's step.
+
+        Arguments:
+            symbol -- the product symbol
+            qty -- the quantity
+        """
+        step, decimals, units = self._get_steps(symbol)[0]
+        # Small slack so that e.g. 0.3 with step 0.1 is not rounded down to 0.2
+        n = int(abs(qty) / step + 1e-9)
+        return format_units(n * units, decimals)
+
+    def _format_price(self, symbol: str, price: float) -> str:
+        """
+        Return the price rounded to the product's tick size.
+
+        Arguments:
+            symbol -- the product symbol
+            price -- the price
+        """
+        tick, decimals, units = self._get_steps(symbol)[1]
+        return format_units(round(price / tick) * units, decimals)
+
     def place_order(
         self, symbol: str, qty: float, price: float | None = None, type: str = "Market"
     ) -> dict:
@@ -218,16 +815,14 @@ class ByBitManager(Exchange):
         """
         if price is None:
             price = 0.0
-        response = self.s.place_order(
-            category="linear",
+        response = self._place(
             symbol=symbol,
             side="Sell" if qty < 0 else "Buy",
             orderType=type,
-            qty=str(abs(qty)),
-            price=str(price),
-            timeInForce="GTC",
-            isLeverage=True,
+            qty=self._format_qty(symbol, qty),
+            price=self._format_price(symbol, price),
         )
+        self._balance = None
         order_id = response["result"]["orderId"]
         resp = {
             "order_id": order_id,
@@ -236,14 +831,40 @@ class ByBitManager(Exchange):
         }
         return resp
 
+    def place_order_async(
+        self, symbol: str, qty: float, price: float | None = None, type: str = "Market"
+    ) -> Future:
+        """
+        Submit an order without waiting for the exchange to acknowledge it.
+
+        Returns a Future that resolves to the same dict as place_order.
+
+        Arguments:
+            symbol -- the product symbol
+            qty -- the quantity to trade
+            price -- the price to trade at
+            type -- the type of order to place
+        """
+        return self._submit(self.place_order, symbol, qty, price, type)
+
+    def cancel_order_async(self, symbol: str, order_id: str) -> Future:
+        """
+        Submit a cancel without waiting for the exchange to acknowledge it.
+
+        Returns a Future that resolves to the same return code as cancel_order.
+
+        Arguments:
+            symbol -- the product symbol
+            order_id -- the order id to cancel
+        """
+        return self._submit(self.cancel_order, symbol, order_id)
+
     def replace_order(
         self, symbol: str, order_id: float, qty: float, price: float
     ) -> dict:
         """Cancel specified limit order and place a new one."""
-        self.s.cancel_order(category="linear", symbol=symbol, orderId=order_id)
-        response = self.place_order(
-            symbol=symbol, qty=qty, price=price, type="Limit", isLeverage=True
-        )
+        self._cancel(symbol=symbol, orderId=order_id)
+        response = self.place_order(symbol=symbol, qty=qty, price=price, type="Limit")
         return response
 
     def place_batch_order(self, symbol: str, qtys: list, prices: list) -> dict:
@@ -257,20 +878,35 @@ class ByBitManager(Exchange):
         """
         orders = [
             {
-                "category": "linear",
                 "symbol": symbol,
                 "orderType": "Limit",
-                "side": "Buy" if qtys[k] > 0 else "Sell",
-                "qty": str(abs(qtys[k])),
-                "price": str(int(prices[k])),
+                "side": "Buy" if qty > 0 else "Sell",
+                "qty": self._format_qty(symbol, qty),
+                "price": self._format_price(symbol, price),
                 "timeInForce": "GTC",
             }
-            for k in range(len(qtys))
+            for qty, price in zip(qtys, prices)
         ]
-        response = self.s.place_batch_order(category="linear", request=orders)
-        resp = [i["orderId"] for i in response["result"]["list"]]
+        responses = self._send_batches(self.s.place_batch_order, orders)
+        resp = [i["orderId"] for r in responses for i in r["result"]["list"]]
         return resp
 
+    def _send_batches(self, fn, orders: list[dict]) -> list[dict]:
+        """
+        Send orders through a batch endpoint, at most BATCH_ORDER_LIMIT per request.
+
+        The requests are sent concurrently; responses are returned in order.
+
+        Arguments:
+            fn -- the pybit batch method
+            orders -- the order requests
+        """
+        pending = [
+            self._submit(fn, category="linear", request=orders[k : k + BATCH_ORDER_LIMIT])
+            for k in range(0, len(orders), BATCH_ORDER_LIMIT)
+        ]
+        return [future.result() for future in pending]
+
     def cancel_order(self, symbol: str, order_id: str):
         """
         Cancel specific limit order based on order id.
@@ -279,7 +915,7 @@ class ByBitManager(Exchange):
             symbol -- the product symbol
             order_id -- the order id to cancel
         """
-        resp = self.s.cancel_order(category="linear", symbol=symbol, orderId=order_id)
+        resp = self._cancel(symbol=symbol, orderId=order_id)
         return resp["retCode"]
 
     def cancel_batch_order(self, symbol: str, order_ids: list) -> dict:
@@ -290,11 +926,10 @@ class ByBitManager(Exchange):
             symbol -- the product symbol
             order_ids -- the order ids to cancel
         """
-        to_cancel = [
-            {"category": "linear", "symbol": symbol, "order_id": i} for i in order_ids
-        ]
-        resp = self.s.cancel_batch_order(category="linear", request=to_cancel)
-        return resp["retCode"]
+        to_cancel = [{"symbol": symbol, "orderId": i} for i in order_ids]
+        responses = self._send_batches(self.s.cancel_batch_order, to_cancel)
+        # The first failing request's code, or 0 if all succeeded
+        return next((r["retCode"] for r in responses if r["retCode"]), 0)
 
     def cancel_all_orders(self, symbol: str) -> dict:
         """
@@ -314,21 +949,31 @@ class ByBitManager(Exchange):
             symbols -- the product symbols
         """
         positions = self.get_positions(symbols)
-        responses = {}
-        for s in symbols:
-            p = positions[s]
-            if p["size"] != 0:
-                resp = self.s.place_order(
-                    category="linear",
-                    symbol=s,
-                    side="Sell" if p["size"] > 0 else "Buy",
-                    orderType="Market",
-                    qty=str(abs(p["size"])),
-                )["retCode"]
-            else:
-                resp = None
-            responses[s] = resp
-        return responses
+        if len(symbols) == 1:
+            positions = {symbols[0]: positions}
+        open_symbols = [s for s in symbols if positions[s]["size"] != 0]
+
+        # Look up the quantity steps of new products in parallel
+        lookups = [
+            self._submit(self._get_steps, s) for s in open_symbols if s not in self._steps
+        ]
+        for future in lookups:
+            future.result()
+
+        # The batch endpoint reports a return code per order
+        orders = [
+            {
+                "symbol": s,
+                "side": "Sell" if positions[s]["size"] > 0 else "Buy",
+                "orderType": "Market",
+                "qty": self._format_qty(s, positions[s]["size"]),
+            }
+            for s in open_symbols
+        ]
+        responses = self._send_batches(self.s.place_batch_order, orders)
+        codes = [info["code"] for r in responses for info in r["retExtInfo"]["list"]]
+        ret_codes = dict(zip(open_symbols, codes))
+        return {s: ret_codes.get(s) for s in symbols}
 
     def set_trading_stop(self, symbol: str, stop_price: int) -> dict:
         """
@@ -339,7 +984,9 @@ class ByBitManager(Exchange):
             stop_price -- the stop loss price
         """
         resp = self.s.set_trading_stop(
-            category="linear", symbol=symbol, stopLoss=str(stop_price)
+            category="linear",
+            symbol=symbol,
+            stopLoss=self._format_price(symbol, stop_price),
         )
         return resp
 
@@ -350,7 +997,8 @@ class ByBitManager(Exchange):
         limit: int = 50,
         start_time: int = None,
         end_time: int = None,
-    ) -> list[dict]:
+        as_frame: bool = False,
+    ) -> list[dict] | pl.DataFrame:
         """
         Get user's trade execution history with filled prices.
 
@@ -359,7 +1007,25 @@ class ByBitManager(Exchange):
             limit -- number of records to return (default: 50, max: 100)
             start_time -- start timestamp in milliseconds (optional)
             end_time -- end timestamp in milliseconds (optional)
+            as_frame -- return a DataFrame instead of a list of dicts
         """
+        if start_time is None and end_time is None and self._account_stream():
+            # Newest first, like the REST API
+            executions = [
+                e for e in reversed(self._executions) if not symbol or e.symbol == symbol
+            ][:limit]
+            # Otherwise older executions may exist that were never streamed
+            if len(executions) == limit:
+                if as_frame:
+                    return pl.DataFrame(
+                        {
+                            name: [getattr(e, name) for e in executions]
+                            for name in Execution.__slots__
+                        },
+                        schema={name: c[1] for name, c in EXECUTION_COLUMNS.items()},
+                    )
+                return [e.as_dict() for e in executions]
+
         params = {"category": "linear", "limit": limit}
         if symbol:
             params["symbol"] = symbol
@@ -371,28 +1037,16 @@ class ByBitManager(Exchange):
         response = self.s.get_executions(**params)
         executions = response["result"]["list"]
 
-        trades = []
-        for exec in executions:
-            trade = {
-                "symbol": exec["symbol"],
-                "side": exec["side"],
-                "price": float(exec["execPrice"]),
-                "qty": float(exec["execQty"]),
-                "exec_type": exec["execType"],
-                "exec_value": float(exec["execValue"]),
-                "exec_fee": float(exec["execFee"]),
-                "fee_rate": float(exec["feeRate"]) if "feeRate" in exec else 0,
-                "exec_time": int(exec["execTime"]),
-                "order_type": exec.get("orderType", ""),
-                "order_price": float(exec.get("orderPrice", 0)),
-            }
-            trades.append(trade)
-
-        return trades
+        trades = records_to_frame(executions, EXECUTION_COLUMNS)
+        return trades if as_frame else trades.to_dicts()
 
     def get_filled_orders(
-        self, symbol: str = None, limit: int = 50, order_filter: str = "Filled"
-    ) -> list[dict]:
+        self,
+        symbol: str = None,
+        limit: int = 50,
+        order_filter: str = "Filled",
+        as_frame: bool = False,
+    ) -> list[dict] | pl.DataFrame:
         """
         Get filled orders with execution prices.
 
@@ -400,6 +1054,7 @@ class ByBitManager(Exchange):
             symbol -- the product symbol (optional, returns all if not specified)
             limit -- number of records to return (default: 50)
             order_filter -- filter by order status (default: 'Filled')
+            as_frame -- return a DataFrame instead of a list of dicts
         """
         params = {"category": "linear", "limit": limit, "orderFilter": order_filter}
         if symbol:
@@ -408,30 +1063,11 @@ class ByBitManager(Exchange):
         response = self.s.get_order_history(**params)
         orders = response["result"]["list"]
 
-        filled_orders = []
-        for order in orders:
-            if order["orderStatus"] == "Filled" or (
-                order_filter != "Filled" and float(order.get("cumExecQty", 0)) > 0
-            ):
-                filled_order = {
-                    "order_id": order["orderId"],
-                    "order_link_id": order.get("orderLinkId", ""),
-                    "symbol": order["symbol"],
-                    "side": order["side"],
-                    "order_type": order["orderType"],
-                    "price": float(order["price"]),
-                    "qty": float(order["qty"]),
-                    "avg_price": float(order.get("avgPrice", 0)),
-                    "cum_exec_qty": float(order.get("cumExecQty", 0)),
-                    "cum_exec_value": float(order.get("cumExecValue", 0)),
-                    "cum_exec_fee": float(order.get("cumExecFee", 0)),
-                    "order_status": order["orderStatus"],
-                    "created_time": int(order["createdTime"]),
-                    "updated_time": int(order["updatedTime"]),
-                }
-                filled_orders.append(filled_order)
-
-        return filled_orders
+        filled = pl.col("order_status") == "Filled"
+        if order_filter != "Filled":
+            filled = filled | (pl.col("cum_exec_qty") > 0)
+        filled_orders = records_to_frame(orders, ORDER_COLUMNS).filter(filled)
+        return filled_orders if as_frame else filled_orders.to_dicts()
 
     def get_pnl(
         self,
@@ -439,7 +1075,8 @@ class ByBitManager(Exchange):
         limit: int = 50,
         start_time: int = None,
         end_time: int = None,
-    ) -> list[dict]:
+        as_frame: bool = False,
+    ) -> list[dict] | pl.DataFrame:
         """
         Get closed PnL records for positions.
 
@@ -448,6 +1085,7 @@ class ByBitManager(Exchange):
             limit -- number of records to return (default: 50)
             start_time -- start timestamp in milliseconds (optional)
             end_time -- end timestamp in milliseconds (optional)
+            as_frame -- return a DataFrame instead of a list of dicts
         """
         params = {"category": "linear", "limit": limit}
         if symbol:
@@ -460,29 +1098,8 @@ class ByBitManager(Exchange):
         response = self.s.get_closed_pnl(**params)
         pnl_records = response["result"]["list"]
 
-        pnl_list = []
-        for record in pnl_records:
-            pnl = {
-                "symbol": record["symbol"],
-                "side": record["side"],
-                "qty": float(record["qty"]),
-                "order_price": float(record.get("orderPrice", 0)),
-                "order_type": record.get("orderType", ""),
-                "exec_type": record.get("execType", ""),
-                "closed_size": float(record.get("closedSize", 0)),
-                "cum_entry_value": float(record.get("cumEntryValue", 0)),
-                "avg_entry_price": float(record.get("avgEntryPrice", 0)),
-                "cum_exit_value": float(record.get("cumExitValue", 0)),
-                "avg_exit_price": float(record.get("avgExitPrice", 0)),
-                "closed_pnl": float(record.get("closedPnl", 0)),
-                "fill_count": int(record.get("fillCount", 0)),
-                "leverage": float(record.get("leverage", 0)),
-                "created_time": int(record["createdTime"]),
-                "updated_time": int(record["updatedTime"]),
-            }
-            pnl_list.append(pnl)
-
-        return pnl_list
+        pnl_list = records_to_frame(pnl_records, PNL_COLUMNS)
+        return pnl_list if as_frame else pnl_list.to_dicts()
 
     # Various helper and dummy methods
     def wait(self, timeout: float):
@@ -1,21 +1,29 @@
+import dataclasses
 import os
-from collections import namedtuple
-
-Config = namedtuple(
-    "Config",
-    (
-        "api_key",
-        "api_secret",
-        "symbol",
-        "coin",
-        "equity",
-        "range",
-        "num_orders",
-        "polling_rate",
-        "tp_dist",
-        "stop_dist",
-    ),
-)
+from dataclasses import dataclass
+
+
+@dataclass(slots=True, frozen=True)
+class Config:
+    """Credentials and strategy parameters, fixed once the run starts."""
+
+    api_key: str
+    api_secret: str
+    symbol: str
+    coin: str
+    equity: float
+    range: float
+    num_orders: int
+    polling_rate: float
+    tp_dist: float
+    stop_dist: float
+
+    def replace(self, **changes) -> "Config":
+        """Return a copy with some fields changed, e.g. for a backtest sweep."""
+        return dataclasses.replace(self, **changes)
+
+    # Name used while Config was a namedtuple
+    _replace = replace
 
 # API credentials - loaded from environment variables
 API_KEY = os.getenv("BYBIT_API_KEY", "your-bybit-api-key-here")
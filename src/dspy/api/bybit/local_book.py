@@ -0,0 +1,209 @@
+"""
+Local order book maintained from Bybit WebSocket snapshots and deltas.
+"""
+
+import threading
+import time
+from itertools import chain
+
+import numpy as np
+
+
+def parse_levels(levels: list[list[str]]) -> np.ndarray:
+    """
+    Convert [price, size] string pairs from the Bybit API to a float array.
+
+    Args:
+        levels: Price levels as lists of two decimal strings
+
+    Returns:
+        Array of shape (n, 2) with price and size columns
+    """
+    return np.fromiter(
+        map(float, chain.from_iterable(levels)),
+        dtype=np.float64,
+        count=2 * len(levels),
+    ).reshape(-1, 2)
+
+
+class LocalBook:
+    """
+    Order book for one product, kept as one preallocated array per side and field.
+
+    Bids are sorted by descending price and asks by ascending price, so level 0
+    is the top of the book on both sides. Messages are applied on the WebSocket
+    thread; readers take the same lock and copy out what they need.
+    """
+
+    def __init__(self, capacity: int = 256):
+        """
+        Allocate empty books.
+
+        Args:
+            capacity: Initial number of levels per side, grown on demand
+        """
+        self._lock = threading.Lock()
+        self.bid_px = np.empty(capacity, dtype=np.float64)
+        self.bid_qty = np.empty(capacity, dtype=np.float64)
+        self.ask_px = np.empty(capacity, dtype=np.float64)
+        self.ask_qty = np.empty(capacity, dtype=np.float64)
+        self.n_bids = 0
+        self.n_asks = 0
+        self.ts = 0  # Exchange timestamp of the last message in ms
+        self.cts = 0  # Matching engine timestamp of the last message in ms
+        self.updated = None  # time.monotonic() when the last message arrived
+
+    def apply(self, message: dict):
+        """
+        Apply an orderbook stream message.
+
+        Args:
+            message: Parsed message with "type" of "snapshot" or "delta"
+        """
+        data = message["data"]
+        bids = parse_levels(data["b"])
+        asks = parse_levels(data["a"])
+        with self._lock:
+            if message["type"] == "snapshot":
+                self.bid_px, self.bid_qty, self.n_bids = self._set_side(
+                    self.bid_px, self.bid_qty, bids, descending=True
+                )
+                self.ask_px, self.ask_qty, self.n_asks = self._set_side(
+                    self.ask_px, self.ask_qty, asks, descending=False
+                )
+            else:
+                self.bid_px, self.bid_qty, self.n_bids = self._update_side(
+                    self.bid_px, self.bid_qty, self.n_bids, bids, descending=True
+                )
+                self.ask_px, self.ask_qty, self.n_asks = self._update_side(
+                    self.ask_px, self.ask_qty, self.n_asks, asks, descending=False
+                )
+            self.ts = message.get("ts", 0)
+            self.cts = message.get("cts", 0)
+            self.updated = time.monotonic()
+
+    @staticmethod
+    def _set_side(
+        px: np.ndarray, qty: np.ndarray, levels: np.ndarray, descending: bool
+    ):
+        """Overwrite one side with the levels, sorted and growing the buffers if needed."""
+        # pybit applies deltas itself and passes its whole book as a snapshot,
+        # with new levels appended at the end, so the levels are sorted here
+        order = np.argsort(-levels[:, 0] if descending else levels[:, 0], kind="stable")
+        levels = levels[order]
+        n = len(levels)
+        if n > len(px):
+            px = np.empty(2 * n, dtype=np.float64)
+            qty = np.empty(2 * n, dtype=np.float64)
+        px[:n] = levels[:, 0]
+        qty[:n] = levels[:, 1]
+        return px, qty, n
+
+    @staticmethod
+    def _update_side(
+        px: np.ndarray,
+        qty: np.ndarray,
+        n: int,
+        levels: np.ndarray,
+        descending: bool,
+    ):
+        """Apply level updates to one side in place; a zero quantity removes the level."""
+        for price, size in levels.tolist():
+            if descending:
+                # Number of levels priced above this one
+                i = n - int(np.searchsorted(px[:n][::-1], price, side="right"))
+            else:
+                # Number of levels priced below this one
+                i = int(np.searchsorted(px[:n], price, side="left"))
+            found = i < n and px[i] == price
+
+            if size == 0.0:
+                if found:
+                    px[i : n - 1] = px[i + 1 : n]
+                    qty[i : n - 1] = qty[i + 1 : n]
+                    n -= 1
+            elif found:
+                qty[i] = size
+            else:
+                if n == len(px):
+                    px = np.concatenate((px, np.empty(n, dtype=np.float64)))
+                    qty = np.concatenate((qty, np.empty(n, dtype=np.float64)))
+                px[i + 1 : n + 1] = px[i:n]
+                qty[i + 1 : n + 1] = qty[i:n]
+                px[i] = price
+                qty[i] = size
+                n += 1
+        return px, qty, n
+
+    def is_fresh(self, max_age: float) -> bool:
+        """
+        Check whether the book has data no older than max_age seconds.
+
+        Args:
+            max_age: Maximum time since the last message in seconds
+        """
+        updated = self.updated
+        return (
+            updated is not None
+            and self.n_bids > 0
+            and self.n_asks > 0
+            and time.monotonic() - updated <= max_age
+        )
+
+    def top(self) -> tuple[float, float, float, float]:
+        """
+        Return best bid price and size and best ask price and size.
+        """
+        with self._lock:
+            return (
+                float(self.bid_px[0]),
+                float(self.bid_qty[0]),
+                float(self.ask_px[0]),
+                float(self.ask_qty[0]),
+            )
+
+    def copy_into(
+        self,
+        bid_px: np.ndarray,
+        bid_qty: np.ndarray,
+        ask_px: np.ndarray,
+        ask_qty: np.ndarray,
+        depth: int,
+    ) -> tuple[int, int, int, int]:
+        """
+        Copy the top levels of both sides into caller-owned arrays.
+
+        Args:
+            bid_px, bid_qty, ask_px, ask_qty: Destination arrays of at least depth elements
+            depth: Number of levels per side
+
+        Returns:
+            Number of bid and ask levels copied, and the exchange and matching
+            engine timestamps
+        """
+        with self._lock:
+            nb = min(depth, self.n_bids)
+            na = min(depth, self.n_asks)
+            bid_px[:nb] = self.bid_px[:nb]
+            bid_qty[:nb] = self.bid_qty[:nb]
+            ask_px[:na] = self.ask_px[:na]
+            ask_qty[:na] = self.ask_qty[:na]
+            return nb, na, self.ts, self.cts
+
+    def levels(self, depth: int) -> tuple[np.ndarray, np.ndarray, int, int]:
+        """
+        Copy out the top levels of both sides.
+
+        Args:
+            depth: Number of levels per side
+
+        Returns:
+            Bids and asks as (n, 2) arrays of price and size, and the exchange
+            and matching engine timestamps
+        """
+        with self._lock:
+            nb = min(depth, self.n_bids)
+            na = min(depth, self.n_asks)
+            bids = np.column_stack((self.bid_px[:nb], self.bid_qty[:nb]))
+            asks = np.column_stack((self.ask_px[:na], self.ask_qty[:na]))
+            return bids, asks, self.ts, self.cts
@@ -0,0 +1,181 @@
+"""
+Records passed to BybitWebSocketStream callbacks.
+
+Each stream message is converted to one of these slotted dataclasses. Fields are
+read as attributes; reading them by key, as with the dicts the stream used to
+pass, still works for existing callbacks.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+
+class _Record:
+    """Key access and dict conversion shared by the stream records."""
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str):
+        """
+        Return a field by name.
+
+        Args:
+            key: The field name
+        """
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def as_dict(self) -> dict:
+        """Return the record as a dict of its fields."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+@dataclass(slots=True, frozen=True)
+class OrderBookRecord(_Record):
+    """An order book snapshot or delta, with levels as (n, 2) arrays of price and size."""
+
+    symbol: str
+    timestamp: int
+    update_id: int
+    bids: np.ndarray
+    asks: np.ndarray
+
+
+@dataclass(slots=True, frozen=True)
+class TradeRecord(_Record):
+    """A public trade; side is 1 for buy and -1 for sell."""
+
+    symbol: str
+    timestamp: int
+    trade_id: str
+    price: float
+    vol: float
+    side: int
+    is_block_trade: bool
+
+
+@dataclass(slots=True, frozen=True)
+class TickerRecord(_Record):
+    """A ticker update with the best bid and ask."""
+
+    symbol: str
+    timestamp: int
+    last_price: float
+    bid_price: float
+    bid_size: float
+    ask_price: float
+    ask_size: float
+    volume_24h: float
+    turnover_24h: float
+    price_24h_change: float
+
+
+@dataclass(slots=True, frozen=True)
+class KlineRecord(_Record):
+    """A candle; confirm is True once the interval has closed."""
+
+    symbol: Optional[str]
+    timestamp: int
+    start_time: int
+    end_time: int
+    interval: str
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    turnover: float
+    confirm: bool
+
+
+@dataclass(slots=True, frozen=True)
+class PositionRecord(_Record):
+    """A position update; side is 1 for long and -1 for short."""
+
+    symbol: str
+    side: int
+    size: float
+    position_value: float
+    entry_price: float
+    mark_price: float
+    liq_price: Optional[float]
+    unrealized_pnl: float
+    realized_pnl: float
+    position_margin: float
+    leverage: float
+    position_status: str
+    adl_rank_indicator: int
+    updated_time: str
+
+
+@dataclass(slots=True, frozen=True)
+class OrderRecord(_Record):
+    """An order update; side is 1 for buy and -1 for sell."""
+
+    order_id: str
+    order_link_id: str
+    symbol: str
+    side: int
+    order_type: str
+    price: float
+    qty: float
+    leaves_qty: float
+    leaves_value: float
+    cum_exec_qty: float
+    cum_exec_value: float
+    cum_exec_fee: float
+    order_status: str
+    time_in_force: str
+    reduce_only: bool
+    close_on_trigger: bool
+    created_time: str
+    updated_time: str
+    trigger_price: Optional[float]
+    trigger_by: str
+    stop_loss: Optional[float]
+    take_profit: Optional[float]
+
+
+@dataclass(slots=True, frozen=True)
+class ExecutionRecord(_Record):
+    """A fill of one of the account's orders; side is 1 for buy and -1 for sell."""
+
+    exec_id: str
+    order_id: str
+    order_link_id: str
+    symbol: str
+    side: int
+    price: float
+    qty: float
+    exec_type: str
+    exec_value: float
+    exec_fee: float
+    exec_time: str
+    is_maker: bool
+    fee_rate: float
+    trade_iv: Optional[float]
+    mark_price: Optional[float]
+    index_price: Optional[float]
+    underlying_price: Optional[float]
+    block_trade_id: str
+
+
+@dataclass(slots=True, frozen=True)
+class WalletRecord(_Record):
+    """A wallet balance update."""
+
+    account_type: str
+    coin: str
+    wallet_balance: float
+    available_balance: float
+    total_order_margin: float
+    total_position_margin: float
+    total_position_mm: float
+    unrealized_pnl: float
+    cum_realized_pnl: float
+    given_cash: float
+    service_cash: float
@@ -27,6 +27,19 @@ Example:
 Notes:
     The WebSocket uses Bybit's public streams which don't require authentication
     for market data. Private streams (orders, positions) would require auth.
+    
+    If orjson is installed (``pip install dspy[json]``), incoming messages are
+    decoded with it instead of the stdlib json module, including inside pybit.
+    
+    Callbacks receive the slotted dataclasses defined in dspy.api.bybit.records,
+    whose fields can be read as attributes or, as with a dict, by key.
+    
+    Callbacks may also be coroutine functions, subscribed from a running event
+    loop; each message is then awaited as a task on that loop.
+    
+    Callbacks subscribed with ``raw=True`` receive each message as it arrives
+    from pybit, with its "topic" and "data" fields, and skip the conversion to
+    the standardized format. Use them to forward or store messages as they are.
 
 See Also:
     dspy.api.bybit.bybit_api: REST API implementation
@@ -34,16 +47,321 @@ See Also:
 """
 
 import asyncio
-import json
+import inspect
 import logging
-from typing import Callable, Dict, List, Optional
+import queue
+import sys
+import threading
+import time
+from dataclasses import fields as dataclass_fields
+from typing import Callable, Dict, Optional, Tuple
 
 from pybit.unified_trading import WebSocket
 
+from dspy.api.bybit._orjson import install_websocket_decoder
+from dspy.api.bybit._orjson import json_loads as _json_loads
 from dspy.api.bybit.config import API_KEY, API_SECRET
+from dspy.api.bybit.local_book import parse_levels
+from dspy.api.bybit.records import (
+    ExecutionRecord,
+    KlineRecord,
+    OrderBookRecord,
+    OrderRecord,
+    PositionRecord,
+    TickerRecord,
+    TradeRecord,
+    WalletRecord,
+)
 
 logger = logging.getLogger(__name__)
 
+install_websocket_decoder()
+
+# Put on a callback queue to stop its worker
+_STOP = object()
+
+# Integer side by the side string of trades, positions, orders and executions
+_SIDE = {"Buy": 1, "Sell": -1}
+
+# One shared string per symbol seen, so records of the same symbol hold the
+# same object rather than a fresh copy from each decoded message
+_SYMBOLS: Dict[str, str] = {}
+
+
+def _intern_symbol(symbol: str):
+    """Make records of a subscribed symbol share the interned subscription string."""
+    symbol = sys.intern(symbol)
+    _SYMBOLS.setdefault(symbol, symbol)
+
+
+# Conversions from stream records to the dataclasses in dspy.api.bybit.records.
+# Each field is (output name, kind, input key); the kinds are expressions over
+# the record d:
+_FIELD_KINDS = {
+    "raw": "d.get({key!r})",
+    "flag": "d.get({key!r}, False)",
+    "float": "float(d.get({key!r}, 0))",
+    # Look the key up once; empty strings and missing keys both map to None
+    "opt_float": "float(v) if (v := d.get({key!r})) else None",
+    "side": "_SIDE.get(d.get({key!r}), -1)",
+    "symbol": "_SYMBOLS.setdefault(v := d.get({key!r}), v)",
+    "ts": "ts",  # the message timestamp, passed separately
+}
+
+TRADE_FIELDS = [
+    ("symbol", "symbol", "s"),
+    ("timestamp", "raw", "T"),
+    ("trade_id", "raw", "i"),
+    ("price", "float", "p"),
+    ("vol", "float", "v"),
+    ("side", "side", "S"),
+    ("is_block_trade", "flag", "BT"),
+]
+
+TICKER_FIELDS = [
+    ("symbol", "symbol", "symbol"),
+    ("timestamp", "ts", None),
+    ("last_price", "float", "lastPrice"),
+    ("bid_price", "float", "bid1Price"),
+    ("bid_size", "float", "bid1Size"),
+    ("ask_price", "float", "ask1Price"),
+    ("ask_size", "float", "ask1Size"),
+    ("volume_24h", "float", "volume24h"),
+    ("turnover_24h", "float", "turnover24h"),
+    ("price_24h_change", "float", "price24hPcnt"),
+]
+
+KLINE_FIELDS = [
+    ("symbol", "symbol", "symbol"),
+    ("timestamp", "raw", "timestamp"),
+    ("start_time", "raw", "start"),
+    ("end_time", "raw", "end"),
+    ("interval", "raw", "interval"),
+    ("open", "float", "open"),
+    ("high", "float", "high"),
+    ("low", "float", "low"),
+    ("close", "float", "close"),
+    ("volume", "float", "volume"),
+    ("turnover", "float", "turnover"),
+    ("confirm", "flag", "confirm"),
+]
+
+POSITION_FIELDS = [
+    ("symbol", "symbol", "symbol"),
+    ("side", "side", "side"),
+    ("size", "float", "size"),
+    ("position_value", "float", "positionValue"),
+    ("entry_price", "float", "avgPrice"),
+    ("mark_price", "float", "markPrice"),
+    ("liq_price", "opt_float", "liqPrice"),
+    ("unrealized_pnl", "float", "unrealisedPnl"),
+    ("realized_pnl", "float", "realisedPnl"),
+    ("position_margin", "float", "positionMM"),
+    ("leverage", "float", "leverage"),
+    ("position_status", "raw", "positionStatus"),
+    ("adl_rank_indicator", "raw", "adlRankIndicator"),
+    ("updated_time", "raw", "updatedTime"),
+]
+
+ORDER_FIELDS = [
+    ("order_id", "raw", "orderId"),
+    ("order_link_id", "raw", "orderLinkId"),
+    ("symbol", "symbol", "symbol"),
+    ("side", "side", "side"),
+    ("order_type", "raw", "orderType"),
+    ("price", "float", "price"),
+    ("qty", "float", "qty"),
+    ("leaves_qty", "float", "leavesQty"),
+    ("leaves_value", "float", "leavesValue"),
+    ("cum_exec_qty", "float", "cumExecQty"),
+    ("cum_exec_value", "float", "cumExecValue"),
+    ("cum_exec_fee", "float", "cumExecFee"),
+    ("order_status", "raw", "orderStatus"),
+    ("time_in_force", "raw", "timeInForce"),
+    ("reduce_only", "flag", "reduceOnly"),
+    ("close_on_trigger", "flag", "closeOnTrigger"),
+    ("created_time", "raw", "createdTime"),
+    ("updated_time", "raw", "updatedTime"),
+    ("trigger_price", "opt_float", "triggerPrice"),
+    ("trigger_by", "raw", "triggerBy"),
+    ("stop_loss", "opt_float", "stopLoss"),
+    ("take_profit", "opt_float", "takeProfit"),
+]
+
+EXECUTION_FIELDS = [
+    ("exec_id", "raw", "execId"),
+    ("order_id", "raw", "orderId"),
+    ("order_link_id", "raw", "orderLinkId"),
+    ("symbol", "symbol", "symbol"),
+    ("side", "side", "side"),
+    ("price", "float", "execPrice"),
+    ("qty", "float", "execQty"),
+    ("exec_type", "raw", "execType"),
+    ("exec_value", "float", "execValue"),
+    ("exec_fee", "float", "execFee"),
+    ("exec_time", "raw", "execTime"),
+    ("is_maker", "flag", "isMaker"),
+    ("fee_rate", "float", "feeRate"),
+    ("trade_iv", "opt_float", "tradeIv"),
+    ("mark_price", "opt_float", "markPrice"),
+    ("index_price", "opt_float", "indexPrice"),
+    ("underlying_price", "opt_float", "underlyingPrice"),
+    ("block_trade_id", "raw", "blockTradeId"),
+]
+
+WALLET_FIELDS = [
+    ("account_type", "raw", "accountType"),
+    ("coin", "raw", "coin"),
+    ("wallet_balance", "float", "walletBalance"),
+    ("available_balance", "float", "availableBalance"),
+    ("total_order_margin", "float", "totalOrderIM"),
+    ("total_position_margin", "float", "totalPositionIM"),
+    ("total_position_mm", "float", "totalPositionMM"),
+    ("unrealized_pnl", "float", "unrealisedPnl"),
+    ("cum_realized_pnl", "float", "cumRealisedPnl"),
+    ("given_cash", "float", "givenCash"),
+    ("service_cash", "float", "serviceCash"),
+]
+
+
+def _compile_converter(name: str, record: type, fields: list) -> Callable:
+    """
+    Generate a function building a standardized record from a stream record.
+    
+    The constructor call is written out with one argument expression per field,
+    so converting a record costs no more than hand-written code, without
+    repeating it for every stream.
+    
+    Args:
+        name: Name of the generated function
+        record: Record dataclass to build, with fields in the order of the specs
+        fields: Field specs as (output name, kind, input key)
+    """
+    names = [f.name for f in dataclass_fields(record)]
+    if names != [out for out, _, _ in fields]:
+        raise ValueError(f"Field specs for {name} do not match {record.__name__}")
+    args = "".join(f"        {_FIELD_KINDS[kind].format(key=key)},\n" for _, kind, key in fields)
+    source = f"def {name}(d, ts=None):\n    return _record(\n{args}    )\n"
+    namespace = {"_SIDE": _SIDE, "_SYMBOLS": _SYMBOLS, "_record": record}
+    exec(source, namespace)
+    return namespace[name]
+
+
+_convert_trade = _compile_converter("_convert_trade", TradeRecord, TRADE_FIELDS)
+_convert_ticker = _compile_converter("_convert_ticker", TickerRecord, TICKER_FIELDS)
+_convert_kline = _compile_converter("_convert_kline", KlineRecord, KLINE_FIELDS)
+_convert_position = _compile_converter("_convert_position", PositionRecord, POSITION_FIELDS)
+_convert_order = _compile_converter("_convert_order", OrderRecord, ORDER_FIELDS)
+_convert_execution = _compile_converter("_convert_execution", ExecutionRecord, EXECUTION_FIELDS)
+_convert_wallet = _compile_converter("_convert_wallet", WalletRecord, WALLET_FIELDS)
+
+# Callbacks called for a message before other threads get a chance to run
+BROADCAST_BATCH_SIZE = 50
+
+
+class QueuedCallback:
+    """
+    Callback run on its own thread, fed through a bounded queue.
+    
+    Calling the object only enqueues the message, so a slow consumer delays
+    neither the WebSocket thread nor the other callbacks. When the queue is full
+    the oldest message is dropped.
+    """
+    
+    def __init__(self, callback: Callable, maxsize: int = 1024):
+        """
+        Wrap a callback; the worker thread starts with start().
+        
+        Args:
+            callback: Function to call with each message
+            maxsize: Most messages held before the oldest are dropped, or 0 for
+                no limit
+        """
+        self.callback = callback
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize)
+        self._thread = None
+        
+    def __call__(self, message):
+        """Enqueue a message, dropping the oldest one if the queue is full."""
+        while True:
+            try:
+                self._queue.put_nowait(message)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+                    
+    def start(self):
+        """Start the worker thread if it is not running."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run,
+                name=f"ws-callback-{getattr(self.callback, '__name__', 'callback')}",
+                daemon=True,
+            )
+            self._thread.start()
+            
+    def close(self):
+        """Stop the worker after it has handled the queued messages."""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+            
+    def _run(self):
+        """Call the callback with queued messages until stopped."""
+        while True:
+            message = self._queue.get()
+            if message is _STOP:
+                return
+            try:
+                self.callback(message)
+            except Exception as e:
+                logger.error("Error in callback %r: %s", self.callback, e)
+
+
+class AsyncCallback:
+    """
+    Coroutine function callback, run as a task on the event loop it was
+    subscribed from.
+    
+    Calling the object from the WebSocket thread only schedules the task. The
+    loop holds tasks weakly, so pending ones are kept here until they finish.
+    """
+    
+    def __init__(self, callback: Callable, loop: asyncio.AbstractEventLoop):
+        """
+        Wrap a coroutine function.
+        
+        Args:
+            callback: Coroutine function to call with each message
+            loop: Event loop to run the calls on
+        """
+        self.callback = callback
+        self.loop = loop
+        self._tasks = set()
+        
+    def __call__(self, message):
+        """Schedule a call with the message on the event loop."""
+        self.loop.call_soon_threadsafe(self._start, message)
+        
+    def _start(self, message):
+        """Start a task for the message on the loop thread and hold it until done."""
+        task = self.loop.create_task(self._run(message))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        
+    async def _run(self, message):
+        """Await the callback, logging instead of raising its errors."""
+        try:
+            await self.callback(message)
+        except Exception as e:
+            logger.error("Error in callback %r: %s", self.callback, e)
+
 
 class BybitWebSocketStream:
     """
@@ -53,7 +371,29 @@ class BybitWebSocketStream:
     handle incoming messages through callbacks.
     """
     
-    def __init__(self, testnet: bool = False, api_key: Optional[str] = None, api_secret: Optional[str] = None):
+    __slots__ = (
+        "testnet",
+        "queue_size",
+        "convert_in_worker",
+        "_workers",
+        "api_key",
+        "api_secret",
+        "ws_public",
+        "ws_private",
+        "callbacks",
+        "raw_callbacks",
+        "subscriptions",
+        "private_subscriptions",
+    )
+    
+    def __init__(
+        self,
+        testnet: bool = False,
+        api_key: Optional[str] = None,
+        api_secret: Optional[str] = None,
+        queue_size: Optional[int] = None,
+        convert_in_worker: bool = False,
+    ):
         """
         Initialize the WebSocket stream client.
         
@@ -61,25 +401,104 @@ class BybitWebSocketStream:
             testnet: Whether to connect to testnet (default: False for mainnet)
             api_key: API key for private streams (default: from environment)
             api_secret: API secret for private streams (default: from environment)
+            queue_size: If set, each callback runs on its own thread behind a
+                queue of this size (see QueuedCallback); by default callbacks
+                run on the WebSocket thread
+            convert_in_worker: Whether to parse and convert the messages of each
+                stream on a worker thread of its own, in arrival order, leaving
+                the WebSocket thread free to keep reading
         """
         self.testnet = testnet
+        self.queue_size = queue_size
+        self.convert_in_worker = convert_in_worker
+        # Message handlers running behind a queue, by stream
+        self._workers: Dict[str, QueuedCallback] = {}
         self.api_key = api_key or API_KEY
         self.api_secret = api_secret or API_SECRET
         self.ws_public = None
         self.ws_private = None
-        self.callbacks: Dict[str, List[Callable]] = {
-            "orderbook": [],
-            "trade": [],
-            "ticker": [],
-            "kline": [],
-            "position": [],
-            "order": [],
-            "execution": [],
-            "wallet": [],
+        # Callbacks by stream, as tuples replaced on each subscription so the
+        # WebSocket threads always iterate a complete snapshot
+        self.callbacks: Dict[str, Tuple[Callable, ...]] = {
+            "orderbook": (),
+            "trade": (),
+            "ticker": (),
+            "kline": (),
+            "position": (),
+            "order": (),
+            "execution": (),
+            "wallet": (),
         }
+        # Callbacks that receive messages unconverted, by stream
+        self.raw_callbacks: Dict[str, Tuple[Callable, ...]] = {kind: () for kind in self.callbacks}
+        # Subscribed streams as (stream type, stream arguments), replayed by start()
         self.subscriptions = []
         self.private_subscriptions = []
         
+    def _add_callback(self, kind: str, callback: Callable, raw: bool):
+        """
+        Register a callback for a stream.
+        
+        Plain functions are called directly, or behind a queue if queue_size is
+        set. Coroutine functions are run on the event loop running at
+        subscription, which is looked up once here rather than per message.
+        """
+        if inspect.iscoroutinefunction(callback):
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                raise ValueError(
+                    "Coroutine function callbacks must be subscribed from a running event loop"
+                ) from None
+            callback = AsyncCallback(callback, loop)
+        elif self.queue_size:
+            callback = QueuedCallback(callback, self.queue_size)
+            if self.ws_public or self.ws_private:
+                callback.start()
+        callbacks = self.raw_callbacks if raw else self.callbacks
+        callbacks[kind] = (*callbacks[kind], callback)
+        
+    def _queued_callbacks(self):
+        """Yield the registered callbacks that run behind a queue."""
+        for callbacks in (*self.callbacks.values(), *self.raw_callbacks.values()):
+            for callback in callbacks:
+                if isinstance(callback, QueuedCallback):
+                    yield callback
+                    
+    def _handler(self, kind: str) -> Callable:
+        """Return the function pybit should call with the messages of a stream."""
+        handler = getattr(self, f"_handle_{kind}")
+        if not self.convert_in_worker:
+            return handler
+        worker = self._workers.get(kind)
+        if worker is None:
+            # Unbounded, since dropping order book deltas would corrupt the book
+            worker = self._workers[kind] = QueuedCallback(handler, 0)
+        worker.start()
+        return worker
+        
+    def _dispatch(self, kind: str, payload, raw: bool = False):
+        """
+        Call the callbacks registered for a stream with a message.
+        
+        A failing callback is logged without skipping the others. With many
+        callbacks, the thread yields between batches of BROADCAST_BATCH_SIZE so
+        the other stream threads are not held up by a long broadcast.
+        
+        Args:
+            kind: The stream type
+            payload: The converted message, or the raw message if raw is set
+            raw: Whether to call the callbacks registered for raw messages
+        """
+        callbacks = self.raw_callbacks if raw else self.callbacks
+        for i, callback in enumerate(callbacks[kind], 1):
+            try:
+                callback(payload)
+            except Exception as e:
+                logger.error("Error in %s %scallback %r: %s", kind, "raw " if raw else "", callback, e)
+            if i % BROADCAST_BATCH_SIZE == 0:
+                time.sleep(0)
+                
     def _create_public_websocket(self):
         """Create public WebSocket instance for market data."""
         self.ws_public = WebSocket(
@@ -99,7 +518,7 @@ class BybitWebSocketStream:
             api_secret=self.api_secret,
         )
         
-    def subscribe_orderbook(self, symbol: str, depth: int = 50, callback: Optional[Callable] = None):
+    def subscribe_orderbook(self, symbol: str, depth: int = 50, callback: Optional[Callable] = None, raw: bool = False):
         """
         Subscribe to order book updates.
         
@@ -110,6 +529,7 @@ class BybitWebSocketStream:
                 - Spot: 1, 50, 200
                 - Option: 25, 100
             callback: Function to call with order book data
+            raw: Whether to pass messages to the callback unconverted
         """
         # Validate depth for linear markets (most common for USDT perpetuals)
         valid_linear_depths = [1, 50, 200, 500]
@@ -118,62 +538,64 @@ class BybitWebSocketStream:
         
         # For now, assume linear market if symbol ends with USDT
         if symbol.endswith("USDT") and depth not in valid_linear_depths:
-            logger.warning(f"Depth {depth} not supported for linear markets. Using 50 instead.")
+            logger.warning("Depth %s not supported for linear markets. Using 50 instead.", depth)
             depth = 50
+        _intern_symbol(symbol)
         if callback:
-            self.callbacks["orderbook"].append(callback)
+            self._add_callback("orderbook", callback, raw)
             
-        channel = f"orderbook.{depth}.{symbol}"
-        self.subscriptions.append(("orderbook", channel))
+        self.subscriptions.append(("orderbook", {"depth": depth, "symbol": symbol}))
         
         if self.ws_public:
             self.ws_public.orderbook_stream(
                 depth=depth,
                 symbol=symbol,
-                callback=self._handle_orderbook
+                callback=self._handler("orderbook")
             )
             
-    def subscribe_trades(self, symbol: str, callback: Optional[Callable] = None):
+    def subscribe_trades(self, symbol: str, callback: Optional[Callable] = None, raw: bool = False):
         """
         Subscribe to trade updates.
         
         Args:
             symbol: Trading symbol (e.g., "BTCUSDT")
             callback: Function to call with trade data
+            raw: Whether to pass messages to the callback unconverted
         """
+        _intern_symbol(symbol)
         if callback:
-            self.callbacks["trade"].append(callback)
+            self._add_callback("trade", callback, raw)
             
-        channel = f"publicTrade.{symbol}"
-        self.subscriptions.append(("trade", channel))
+        self.subscriptions.append(("trade", {"symbol": symbol}))
         
         if self.ws_public:
             self.ws_public.trade_stream(
                 symbol=symbol,
-                callback=self._handle_trade
+                callback=self._handler("trade")
             )
             
-    def subscribe_ticker(self, symbol: str, callback: Optional[Callable] = None):
+    def subscribe_ticker(self, symbol: str, callback: Optional[Callable] = None, raw: bool = False):
         """
         Subscribe to ticker updates (best bid/ask).
         
         Args:
             symbol: Trading symbol (e.g., "BTCUSDT")
             callback: Function to call with ticker data
+            raw: Whether to pass messages to the callback unconverted
         """
+        _intern_symbol(symbol)
         if callback:
-            self.callbacks["ticker"].append(callback)
+            self._add_callback("ticker", callback, raw)
             
-        channel = f"tickers.{symbol}"
-        self.subscriptions.append(("ticker", channel))
+        self.subscriptions.append(("ticker", {"symbol": symbol}))
         
         if self.ws_public:
             self.ws_public.ticker_stream(
                 symbol=symbol,
-                callback=self._handle_ticker
+                callback=self._handler("ticker")
             )
             
-    def subscribe_kline(self, symbol: str, interval: str = "1", callback: Optional[Callable] = None):
+    def subscribe_kline(self, symbol: str, interval: str = "1", callback: Optional[Callable] = None, raw: bool = False):
         """
         Subscribe to kline/candlestick updates.
         
@@ -181,321 +603,244 @@ class BybitWebSocketStream:
             symbol: Trading symbol (e.g., "BTCUSDT")
             interval: Kline interval (1, 3, 5, 15, 30, 60, 120, 240, 360, 720, D, W, M)
             callback: Function to call with kline data
+            raw: Whether to pass messages to the callback unconverted
         """
+        _intern_symbol(symbol)
         if callback:
-            self.callbacks["kline"].append(callback)
+            self._add_callback("kline", callback, raw)
             
-        channel = f"kline.{interval}.{symbol}"
-        self.subscriptions.append(("kline", channel))
+        self.subscriptions.append(("kline", {"interval": interval, "symbol": symbol}))
         
         if self.ws_public:
             self.ws_public.kline_stream(
                 interval=interval,
                 symbol=symbol,
-                callback=self._handle_kline
+                callback=self._handler("kline")
             )
             
     def _handle_orderbook(self, message):
         """Process order book update messages."""
         try:
+            self._dispatch("orderbook", message, raw=True)
+            if not self.callbacks["orderbook"]:
+                return
             data = self._parse_message(message)
             if data:
-                # Convert to standardized format
-                formatted_data = {
-                    "symbol": data.get("s"),
-                    "timestamp": data.get("ts"),
-                    "update_id": data.get("u"),
-                    "bids": [(float(price), float(qty)) for price, qty in data.get("b", [])],
-                    "asks": [(float(price), float(qty)) for price, qty in data.get("a", [])],
-                }
+                # Levels are nested under "data" in stream messages
+                book = data.get("data", data)
+                # Convert to standardized format, with levels as (n, 2) arrays
+                # of price and size
+                formatted_data = OrderBookRecord(
+                    _SYMBOLS.setdefault(symbol := book.get("s"), symbol),
+                    data.get("ts"),
+                    book.get("u"),
+                    parse_levels(book.get("b", [])),
+                    parse_levels(book.get("a", [])),
+                )
                 
                 # Call all registered callbacks
-                for callback in self.callbacks["orderbook"]:
-                    callback(formatted_data)
+                self._dispatch("orderbook", formatted_data)
                     
         except Exception as e:
-            logger.error(f"Error handling orderbook message: {e}")
+            logger.error("Error handling orderbook message: %s", e)
             
     def _handle_trade(self, message):
         """Process trade update messages."""
         try:
+            self._dispatch("trade", message, raw=True)
+            if not self.callbacks["trade"]:
+                return
             data = self._parse_message(message)
             if data and "data" in data:
                 for trade in data["data"]:
                     # Convert to standardized format with integer side
-                    formatted_trade = {
-                        "symbol": trade.get("s"),
-                        "timestamp": trade.get("T"),
-                        "trade_id": trade.get("i"),
-                        "price": float(trade.get("p", 0)),
-                        "vol": float(trade.get("v", 0)),  # Using 'vol' as per your convention
-                        "side": 1 if trade.get("S") == "Buy" else -1,  # 1 for buy, -1 for sell
-                        "is_block_trade": trade.get("BT", False),
-                    }
+                    formatted_trade = _convert_trade(trade)
                     
                     # Call all registered callbacks
-                    for callback in self.callbacks["trade"]:
-                        callback(formatted_trade)
+                    self._dispatch("trade", formatted_trade)
                         
         except Exception as e:
-            logger.error(f"Error handling trade message: {e}")
+            logger.error("Error handling trade message: %s", e)
             
     def _handle_ticker(self, message):
         """Process ticker update messages."""
         try:
+            self._dispatch("ticker", message, raw=True)
+            if not self.callbacks["ticker"]:
+                return
             data = self._parse_message(message)
             if data and "data" in data:
                 ticker_data = data["data"]
                 
                 # Convert to standardized format
-                formatted_ticker = {
-                    "symbol": ticker_data.get("symbol"),
-                    "timestamp": data.get("ts"),
-                    "last_price": float(ticker_data.get("lastPrice", 0)),
-                    "bid_price": float(ticker_data.get("bid1Price", 0)),
-                    "bid_size": float(ticker_data.get("bid1Size", 0)),
-                    "ask_price": float(ticker_data.get("ask1Price", 0)),
-                    "ask_size": float(ticker_data.get("ask1Size", 0)),
-                    "volume_24h": float(ticker_data.get("volume24h", 0)),
-                    "turnover_24h": float(ticker_data.get("turnover24h", 0)),
-                    "price_24h_change": float(ticker_data.get("price24hPcnt", 0)),
-                }
+                formatted_ticker = _convert_ticker(ticker_data, data.get("ts"))
                 
                 # Call all registered callbacks
-                for callback in self.callbacks["ticker"]:
-                    callback(formatted_ticker)
+                self._dispatch("ticker", formatted_ticker)
                     
         except Exception as e:
-            logger.error(f"Error handling ticker message: {e}")
+            logger.error("Error handling ticker message: %s", e)
             
     def _handle_kline(self, message):
         """Process kline update messages."""
         try:
+            self._dispatch("kline", message, raw=True)
+            if not self.callbacks["kline"]:
+                return
             data = self._parse_message(message)
             if data and "data" in data:
                 for kline in data["data"]:
                     # Convert to standardized format
-                    formatted_kline = {
-                        "symbol": kline.get("symbol"),
-                        "timestamp": kline.get("timestamp"),
-                        "start_time": kline.get("start"),
-                        "end_time": kline.get("end"),
-                        "interval": kline.get("interval"),
-                        "open": float(kline.get("open", 0)),
-                        "high": float(kline.get("high", 0)),
-                        "low": float(kline.get("low", 0)),
-                        "close": float(kline.get("close", 0)),
-                        "volume": float(kline.get("volume", 0)),
-                        "turnover": float(kline.get("turnover", 0)),
-                        "confirm": kline.get("confirm", False),
-                    }
+                    formatted_kline = _convert_kline(kline)
                     
                     # Call all registered callbacks
-                    for callback in self.callbacks["kline"]:
-                        callback(formatted_kline)
+                    self._dispatch("kline", formatted_kline)
                         
         except Exception as e:
-            logger.error(f"Error handling kline message: {e}")
+            logger.error("Error handling kline message: %s", e)
             
     def _parse_message(self, message):
         """Parse WebSocket message to extract data."""
-        if isinstance(message, str):
-            return json.loads(message)
+        if isinstance(message, (str, bytes, bytearray)):
+            return _json_loads(message)
         return message
         
     # Private stream methods
-    def subscribe_positions(self, callback: Optional[Callable] = None):
+    def subscribe_positions(self, callback: Optional[Callable] = None, raw: bool = False):
         """
         Subscribe to position updates (requires authentication).
         
         Args:
             callback: Function to call with position data
+            raw: Whether to pass messages to the callback unconverted
         """
         if callback:
-            self.callbacks["position"].append(callback)
+            self._add_callback("position", callback, raw)
             
-        self.private_subscriptions.append(("position", "position"))
+        self.private_subscriptions.append(("position", {}))
         
         if self.ws_private:
-            self.ws_private.position_stream(callback=self._handle_position)
+            self.ws_private.position_stream(callback=self._handler("position"))
             
-    def subscribe_orders(self, callback: Optional[Callable] = None):
+    def subscribe_orders(self, callback: Optional[Callable] = None, raw: bool = False):
         """
         Subscribe to order updates (requires authentication).
         
         Args:
             callback: Function to call with order data
+            raw: Whether to pass messages to the callback unconverted
         """
         if callback:
-            self.callbacks["order"].append(callback)
+            self._add_callback("order", callback, raw)
             
-        self.private_subscriptions.append(("order", "order"))
+        self.private_subscriptions.append(("order", {}))
         
         if self.ws_private:
-            self.ws_private.order_stream(callback=self._handle_order)
+            self.ws_private.order_stream(callback=self._handler("order"))
             
-    def subscribe_executions(self, callback: Optional[Callable] = None):
+    def subscribe_executions(self, callback: Optional[Callable] = None, raw: bool = False):
         """
         Subscribe to execution/fill updates (requires authentication).
         
         Args:
             callback: Function to call with execution data
+            raw: Whether to pass messages to the callback unconverted
         """
         if callback:
-            self.callbacks["execution"].append(callback)
+            self._add_callback("execution", callback, raw)
             
-        self.private_subscriptions.append(("execution", "execution"))
+        self.private_subscriptions.append(("execution", {}))
         
         if self.ws_private:
-            self.ws_private.execution_stream(callback=self._handle_execution)
+            self.ws_private.execution_stream(callback=self._handler("execution"))
             
-    def subscribe_wallet(self, callback: Optional[Callable] = None):
+    def subscribe_wallet(self, callback: Optional[Callable] = None, raw: bool = False):
         """
         Subscribe to wallet balance updates (requires authentication).
         
         Args:
             callback: Function to call with wallet data
+            raw: Whether to pass messages to the callback unconverted
         """
         if callback:
-            self.callbacks["wallet"].append(callback)
+            self._add_callback("wallet", callback, raw)
             
-        self.private_subscriptions.append(("wallet", "wallet"))
+        self.private_subscriptions.append(("wallet", {}))
         
         if self.ws_private:
-            self.ws_private.wallet_stream(callback=self._handle_wallet)
+            self.ws_private.wallet_stream(callback=self._handler("wallet"))
             
     def _handle_position(self, message):
         """Process position update messages."""
         try:
+            self._dispatch("position", message, raw=True)
+            if not self.callbacks["position"]:
+                return
             data = self._parse_message(message)
             if data and "data" in data:
                 for position in data["data"]:
                     # Convert to standardized format
-                    formatted_position = {
-                        "symbol": position.get("symbol"),
-                        "side": 1 if position.get("side") == "Buy" else -1,
-                        "size": float(position.get("size", 0)),
-                        "position_value": float(position.get("positionValue", 0)),
-                        "entry_price": float(position.get("avgPrice", 0)),
-                        "mark_price": float(position.get("markPrice", 0)),
-                        "liq_price": float(position.get("liqPrice", 0)) if position.get("liqPrice") else None,
-                        "unrealized_pnl": float(position.get("unrealisedPnl", 0)),
-                        "realized_pnl": float(position.get("realisedPnl", 0)),
-                        "position_margin": float(position.get("positionMM", 0)),
-                        "leverage": float(position.get("leverage", 0)),
-                        "position_status": position.get("positionStatus"),
-                        "adl_rank_indicator": position.get("adlRankIndicator"),
-                        "updated_time": position.get("updatedTime"),
-                    }
+                    formatted_position = _convert_position(position)
                     
                     # Call all registered callbacks
-                    for callback in self.callbacks["position"]:
-                        callback(formatted_position)
+                    self._dispatch("position", formatted_position)
                         
         except Exception as e:
-            logger.error(f"Error handling position message: {e}")
+            logger.error("Error handling position message: %s", e)
             
     def _handle_order(self, message):
         """Process order update messages."""
         try:
+            self._dispatch("order", message, raw=True)
+            if not self.callbacks["order"]:
+                return
             data = self._parse_message(message)
             if data and "data" in data:
                 for order in data["data"]:
                     # Convert to standardized format
-                    formatted_order = {
-                        "order_id": order.get("orderId"),
-                        "order_link_id": order.get("orderLinkId"),
-                        "symbol": order.get("symbol"),
-                        "side": 1 if order.get("side") == "Buy" else -1,
-                        "order_type": order.get("orderType"),
-                        "price": float(order.get("price", 0)),
-                        "qty": float(order.get("qty", 0)),
-                        "leaves_qty": float(order.get("leavesQty", 0)),
-                        "leaves_value": float(order.get("leavesValue", 0)),
-                        "cum_exec_qty": float(order.get("cumExecQty", 0)),
-                        "cum_exec_value": float(order.get("cumExecValue", 0)),
-                        "cum_exec_fee": float(order.get("cumExecFee", 0)),
-                        "order_status": order.get("orderStatus"),
-                        "time_in_force": order.get("timeInForce"),
-                        "reduce_only": order.get("reduceOnly", False),
-                        "close_on_trigger": order.get("closeOnTrigger", False),
-                        "created_time": order.get("createdTime"),
-                        "updated_time": order.get("updatedTime"),
-                        "trigger_price": float(order.get("triggerPrice", 0)) if order.get("triggerPrice") else None,
-                        "trigger_by": order.get("triggerBy"),
-                        "stop_loss": float(order.get("stopLoss", 0)) if order.get("stopLoss") else None,
-                        "take_profit": float(order.get("takeProfit", 0)) if order.get("takeProfit") else None,
-                    }
+                    formatted_order = _convert_order(order)
                     
                     # Call all registered callbacks
-                    for callback in self.callbacks["order"]:
-                        callback(formatted_order)
+                    self._dispatch("order", formatted_order)
                         
         except Exception as e:
-            logger.error(f"Error handling order message: {e}")
+            logger.error("Error handling order message: %s", e)
             
     def _handle_execution(self, message):
         """Process execution/fill messages."""
         try:
+            self._dispatch("execution", message, raw=True)
+            if not self.callbacks["execution"]:
+                return
             data = self._parse_message(message)
             if data and "data" in data:
                 for execution in data["data"]:
                     # Convert to standardized format
-                    formatted_execution = {
-                        "exec_id": execution.get("execId"),
-                        "order_id": execution.get("orderId"),
-                        "order_link_id": execution.get("orderLinkId"),
-                        "symbol": execution.get("symbol"),
-                        "side": 1 if execution.get("side") == "Buy" else -1,
-                        "price": float(execution.get("execPrice", 0)),
-                        "qty": float(execution.get("execQty", 0)),
-                        "exec_type": execution.get("execType"),
-                        "exec_value": float(execution.get("execValue", 0)),
-                        "exec_fee": float(execution.get("execFee", 0)),
-                        "exec_time": execution.get("execTime"),
-                        "is_maker": execution.get("isMaker", False),
-                        "fee_rate": float(execution.get("feeRate", 0)),
-                        "trade_iv": float(execution.get("tradeIv", 0)) if execution.get("tradeIv") else None,
-                        "mark_price": float(execution.get("markPrice", 0)) if execution.get("markPrice") else None,
-                        "index_price": float(execution.get("indexPrice", 0)) if execution.get("indexPrice") else None,
-                        "underlying_price": float(execution.get("underlyingPrice", 0)) if execution.get("underlyingPrice") else None,
-                        "block_trade_id": execution.get("blockTradeId"),
-                    }
+                    formatted_execution = _convert_execution(execution)
                     
                     # Call all registered callbacks
-                    for callback in self.callbacks["execution"]:
-                        callback(formatted_execution)
+                    self._dispatch("execution", formatted_execution)
                         
         except Exception as e:
-            logger.error(f"Error handling execution message: {e}")
+            logger.error("Error handling execution message: %s", e)
             
     def _handle_wallet(self, message):
         """Process wallet balance update messages."""
         try:
+            self._dispatch("wallet", message, raw=True)
+            if not self.callbacks["wallet"]:
+                return
             data = self._parse_message(message)
             if data and "data" in data:
                 for wallet in data["data"]:
                     # Convert to standardized format
-                    formatted_wallet = {
-                        "account_type": wallet.get("accountType"),
-                        "coin": wallet.get("coin"),
-                        "wallet_balance": float(wallet.get("walletBalance", 0)),
-                        "available_balance": float(wallet.get("availableBalance", 0)),
-                        "total_order_margin": float(wallet.get("totalOrderIM", 0)),
-                        "total_position_margin": float(wallet.get("totalPositionIM", 0)),
-                        "total_position_mm": float(wallet.get("totalPositionMM", 0)),
-                        "unrealized_pnl": float(wallet.get("unrealisedPnl", 0)),
-                        "cum_realized_pnl": float(wallet.get("cumRealisedPnl", 0)),
-                        "given_cash": float(wallet.get("givenCash", 0)),
-                        "service_cash": float(wallet.get("serviceCash", 0)),
-                    }
+                    formatted_wallet = _convert_wallet(wallet)
                     
                     # Call all registered callbacks
-                    for callback in self.callbacks["wallet"]:
-                        callback(formatted_wallet)
+                    self._dispatch("wallet", formatted_wallet)
                         
         except Exception as e:
-            logger.error(f"Error handling wallet message: {e}")
+            logger.error("Error handling wallet message: %s", e)
         
     def start(self):
         """Start the WebSocket connection and begin streaming."""
@@ -509,52 +854,30 @@ class BybitWebSocketStream:
             
         logger.info("Starting Bybit WebSocket streams...")
         
+        for callback in self._queued_callbacks():
+            callback.start()
+        
         # Re-subscribe to all public channels
         if self.ws_public:
-            for stream_type, channel in self.subscriptions:
-                if stream_type == "orderbook":
-                    # Extract depth and symbol from channel
-                    parts = channel.split(".")
-                    depth = int(parts[1])
-                    symbol = parts[2]
-                    self.ws_public.orderbook_stream(
-                        depth=depth,
-                        symbol=symbol,
-                        callback=self._handle_orderbook
-                    )
-                elif stream_type == "trade":
-                    symbol = channel.split(".")[-1]
-                    self.ws_public.trade_stream(
-                        symbol=symbol,
-                        callback=self._handle_trade
-                    )
-                elif stream_type == "ticker":
-                    symbol = channel.split(".")[-1]
-                    self.ws_public.ticker_stream(
-                        symbol=symbol,
-                        callback=self._handle_ticker
-                    )
-                elif stream_type == "kline":
-                    parts = channel.split(".")
-                    interval = parts[1]
-                    symbol = parts[2]
-                    self.ws_public.kline_stream(
-                        interval=interval,
-                        symbol=symbol,
-                        callback=self._handle_kline
-                    )
-                    
+            streams = {
+                "orderbook": self.ws_public.orderbook_stream,
+                "trade": self.ws_public.trade_stream,
+                "ticker": self.ws_public.ticker_stream,
+                "kline": self.ws_public.kline_stream,
+            }
+            for stream_type, params in self.subscriptions:
+                streams[stream_type](callback=self._handler(stream_type), **params)
+                
         # Re-subscribe to all private channels
         if self.ws_private:
-            for stream_type, channel in self.private_subscriptions:
-                if stream_type == "position":
-                    self.ws_private.position_stream(callback=self._handle_position)
-                elif stream_type == "order":
-                    self.ws_private.order_stream(callback=self._handle_order)
-                elif stream_type == "execution":
-                    self.ws_private.execution_stream(callback=self._handle_execution)
-                elif stream_type == "wallet":
-                    self.ws_private.wallet_stream(callback=self._handle_wallet)
+            streams = {
+                "position": self.ws_private.position_stream,
+                "order": self.ws_private.order_stream,
+                "execution": self.ws_private.execution_stream,
+                "wallet": self.ws_private.wallet_stream,
+            }
+            for stream_type, params in self.private_subscriptions:
+                streams[stream_type](callback=self._handler(stream_type), **params)
                     
         logger.info("WebSocket streams started")
         
@@ -570,6 +893,13 @@ class BybitWebSocketStream:
             self.ws_private.exit()
             self.ws_private = None
             
+        # Conversion workers hand their backlog to the queued callbacks, so they
+        # are drained first
+        for worker in self._workers.values():
+            worker.close()
+        for callback in self._queued_callbacks():
+            callback.close()
+            
         logger.info("WebSocket streams stopped")
             
     def __enter__(self):
@@ -585,15 +915,15 @@ class BybitWebSocketStream:
 # Example usage functions
 def example_orderbook_handler(data):
     """Example handler for order book updates."""
-    print(f"Order book update for {data['symbol']}:")
-    print(f"  Best bid: {data['bids'][0][0] if data['bids'] else 'N/A'}")
-    print(f"  Best ask: {data['asks'][0][0] if data['asks'] else 'N/A'}")
+    print(f"Order book update for {data.symbol}:")
+    print(f"  Best bid: {data.bids[0][0] if len(data.bids) else 'N/A'}")
+    print(f"  Best ask: {data.asks[0][0] if len(data.asks) else 'N/A'}")
     
 
 def example_trade_handler(data):
     """Example handler for trade updates."""
-    side = "BUY" if data['side'] == 1 else "SELL"
-    print(f"Trade: {data['symbol']} {side} {data['vol']} @ {data['price']}")
+    side = "BUY" if data.side == 1 else "SELL"
+    print(f"Trade: {data.symbol} {side} {data.vol} @ {data.price}")
 
 
 if __name__ == "__main__":
@@ -610,7 +940,7 @@ if __name__ == "__main__":
         
         # Keep the connection alive
         while True:
-            asyncio.sleep(1)
+            time.sleep(1)
             
     except KeyboardInterrupt:
         print("\nStopping stream...")
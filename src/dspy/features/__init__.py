@@ -3,6 +3,7 @@ from .book_features import (
     add_spread,
     add_volume,
     add_vwap,
+    add_book_features,
     add_rel_returns,
     add_log_returns,
 )
@@ -16,6 +17,7 @@ __all__ = [
     "add_spread",
     "add_volume",
     "add_vwap",
+    "add_book_features",
     "add_rel_returns",
     "add_log_returns",
     "add_size",
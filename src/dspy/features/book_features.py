@@ -2,148 +2,179 @@
 Module for generating features from book data.
 
 This module provides functions to add spread, volume, and other features to order book data.
+Each function accepts a DataFrame or a LazyFrame and returns the same kind; chaining them
+on a LazyFrame lets polars plan all features as one pass over the data.
 """
 
 import polars as pl
 
-from dspy.features.utils import get_products
+from dspy.features.utils import Frame, get_products
 # Features for prices
 
 
+def _mid_exprs(products: list[str], cols: list[str]) -> list[pl.Expr]:
+    """Mid price expressions for each product, or one unsuffixed if there are none."""
+    if products == []:
+        return [((pl.col(f"{cols[0]}") + pl.col(f"{cols[1]}")) / 2).alias("mid")]
+    return [
+        (
+            (pl.col(f"{cols[0]}_{product}") + pl.col(f"{cols[1]}_{product}")) / 2
+        ).alias(f"mid_{product}")
+        for product in products
+    ]
+
+
+def _spread_exprs(products: list[str], cols: list[str]) -> list[pl.Expr]:
+    """Spread expressions for each product, or one unsuffixed if there are none."""
+    if products == []:
+        return [(pl.col(f"{cols[0]}") - pl.col(f"{cols[1]}")).alias("spread")]
+    return [
+        (pl.col(f"{cols[0]}_{product}") - pl.col(f"{cols[1]}_{product}")).alias(
+            f"spread_{product}"
+        )
+        for product in products
+    ]
+
+
+def _volume_exprs(products: list[str], cols: list[str]) -> list[pl.Expr]:
+    """Volume expressions for each product, or one unsuffixed if there are none."""
+    if products == []:
+        return [(pl.col(f"{cols[0]}") + pl.col(f"{cols[1]}")).alias("volume")]
+    return [
+        (pl.col(f"{cols[0]}_{product}") + pl.col(f"{cols[1]}_{product}")).alias(
+            f"volume_{product}"
+        )
+        for product in products
+    ]
+
+
+def _vwap(prc_0: str, prc_1: str, vol_0: str, vol_1: str) -> pl.Expr:
+    """Size-weighted average of two prices, 0 where both sizes are 0."""
+    # Sizes are non-negative, so a zero total makes the division 0/0 = NaN; filling
+    # it afterwards keeps the kernel a plain division with no per-row branch
+    return (
+        (pl.col(prc_0) * pl.col(vol_0) + pl.col(prc_1) * pl.col(vol_1))
+        / (pl.col(vol_0) + pl.col(vol_1))
+    ).fill_nan(0.0)
+
+
+def _vwap_exprs(products: list[str], cols: list[str]) -> list[pl.Expr]:
+    """VWAP expressions for each product, or one unsuffixed if there are none."""
+    if products == []:
+        return [_vwap(*cols[:4]).alias("vwap")]
+    return [
+        _vwap(*(f"{col}_{product}" for col in cols[:4])).alias(f"vwap_{product}")
+        for product in products
+    ]
+
+
 def add_mid(
-    df: pl.DataFrame,
+    df: Frame,
     products: list[str] | None = None,
     cols: list[str] = ["prc_s0", "prc_s1"],
-) -> pl.DataFrame:
+) -> Frame:
     """
     Add a mid column to the DataFrame.
     """
     if products is None:
         products = get_products(df, cols)
-
-    if products == []:
-        return df.with_columns(
-            ((pl.col(f"{cols[0]}") + pl.col(f"{cols[1]}")) / 2).alias("mid")
-        )
-    for product in products:
-        df = df.with_columns(
-            (
-                (pl.col(f"{cols[0]}_{product}") + pl.col(f"{cols[1]}_{product}")) / 2
-            ).alias(f"mid_{product}")
-        )
-    return df
+    return df.with_columns(_mid_exprs(products, cols))
 
 
 def add_spread(
-    df: pl.DataFrame,
+    df: Frame,
     products: list[str] | None = None,
     cols: list[str] = ["prc_s0", "prc_s1"],
-) -> pl.DataFrame:
+) -> Frame:
     """
     Add a spread column to the DataFrame.
     """
     if products is None:
         products = get_products(df, cols)
-
-    if products == []:
-        return df.with_columns(
-            (pl.col(f"{cols[0]}") - pl.col(f"{cols[1]}")).alias("spread")
-        )
-    for product in products:
-        df = df.with_columns(
-            (pl.col(f"{cols[0]}_{product}") - pl.col(f"{cols[1]}_{product}")).alias(
-                f"spread_{product}"
-            )
-        )
-    return df
+    return df.with_columns(_spread_exprs(products, cols))
 
 
 def add_volume(
-    df: pl.DataFrame,
+    df: Frame,
     products: list[str] | None = None,
     cols: list[str] = ["vol_s0", "vol_s1"],
-) -> pl.DataFrame:
+) -> Frame:
     """
     Add a volume column to the DataFrame.
     """
     if products is None:
         products = get_products(df, cols)
-
-    if products == []:
-        return df.with_columns(
-            (pl.col(f"{cols[0]}") + pl.col(f"{cols[1]}")).alias("volume")
-        )
-    for product in products:
-        df = df.with_columns(
-            (pl.col(f"{cols[0]}_{product}") + pl.col(f"{cols[1]}_{product}")).alias(
-                f"volume_{product}"
-            )
-        )
-    return df
+    return df.with_columns(_volume_exprs(products, cols))
 
 
 def add_vwap(
-    df: pl.DataFrame,
+    df: Frame,
     products: list[str] | None = None,
     cols: list[str] = ["prc_s0", "prc_s1", "vol_s0", "vol_s1"],
-) -> pl.DataFrame:
+) -> Frame:
     """
     Add a VWAP column to the DataFrame.
     """
     if products is None:
         products = get_products(df, cols)
+    return df.with_columns(_vwap_exprs(products, cols))
 
-    if products == []:
-        df = df.with_columns(
-            pl.when(pl.col(f"{cols[2]}") + pl.col(f"{cols[3]}") > 0)
-            .then(
-                (
-                    (
-                        pl.col(f"{cols[0]}") * pl.col(f"{cols[2]}")
-                        + pl.col(f"{cols[1]}") * pl.col(f"{cols[3]}")
-                    )
-                    / (pl.col(f"{cols[2]}") + pl.col(f"{cols[3]}"))
-                )
-            )
-            .otherwise(pl.lit(0))
-            .alias("vwap")
-        )
-    else:
-        for product in products:
-            df = df.with_columns(
-                pl.when(
-                    pl.col(f"{cols[2]}_{product}") + pl.col(f"{cols[3]}_{product}") > 0
-                )
-                .then(
-                    (
-                        (
-                            pl.col(f"{cols[0]}_{product}")
-                            * pl.col(f"{cols[2]}_{product}")
-                            + pl.col(f"{cols[1]}_{product}")
-                            * pl.col(f"{cols[3]}_{product}")
-                        )
-                        / (
-                            pl.col(f"{cols[2]}_{product}")
-                            + pl.col(f"{cols[3]}_{product}")
-                        )
-                    )
-                )
-                .otherwise(pl.lit(0))
-                .alias(f"vwap_{product}")
+
+# Expression builders of add_book_features, and whether each takes prices, sizes or both
+_BOOK_FEATURES = {
+    "mid": (_mid_exprs, "prc"),
+    "spread": (_spread_exprs, "prc"),
+    "volume": (_volume_exprs, "vol"),
+    "vwap": (_vwap_exprs, "both"),
+}
+
+
+def add_book_features(
+    df: Frame,
+    features: list[str] = ["mid", "spread", "volume", "vwap"],
+    products: list[str] | None = None,
+    prc_cols: list[str] = ["prc_s0", "prc_s1"],
+    vol_cols: list[str] = ["vol_s0", "vol_s1"],
+) -> Frame:
+    """
+    Add several book features to the DataFrame in one pass.
+
+    The columns match those of calling add_mid, add_spread, add_volume and
+    add_vwap in turn, but all are computed by a single with_columns.
+
+    Args:
+        df: Book data with price and size columns, suffixed by product if there are several
+        features: Any of "mid", "spread", "volume" and "vwap"
+        products: Products to compute features for; found from the columns if None
+        prc_cols: Bid and ask price column prefixes
+        vol_cols: Bid and ask size column prefixes
+
+    Returns:
+        The input with the feature columns added
+    """
+    exprs = []
+    for feature in features:
+        if feature not in _BOOK_FEATURES:
+            raise ValueError(
+                f"Unknown book feature '{feature}', expected one of {list(_BOOK_FEATURES)}"
             )
-    return df
+        build, kind = _BOOK_FEATURES[feature]
+        cols = {"prc": prc_cols, "vol": vol_cols, "both": prc_cols + vol_cols}[kind]
+        feature_products = get_products(df, cols) if products is None else products
+        exprs.extend(build(feature_products, cols))
+    return df.with_columns(exprs)
 
 
 def add_rel_returns(
-    df: pl.DataFrame, products: list[str] | None = None, cols: list[str] = ["mid"]
-) -> pl.DataFrame:
+    df: Frame, products: list[str] | None = None, cols: list[str] = ["mid"]
+) -> Frame:
     """
     Add a relative return column to the DataFrame.
     """
-    if products is None:
-        products = get_products(df, cols)
     if isinstance(cols, str):
         cols = [cols]
+    if products is None:
+        products = get_products(df, cols)
 
     if products == []:
         df = df.with_columns(pl.col(f"{cols[0]}").pct_change().alias("rel_return"))
@@ -161,15 +192,15 @@ def add_rel_returns(
 
 
 def add_log_returns(
-    df: pl.DataFrame, products: list[str] | None = None, cols: list[str] = ["mid"]
-) -> pl.DataFrame:
+    df: Frame, products: list[str] | None = None, cols: list[str] = ["mid"]
+) -> Frame:
     """
     Add a log return column to the DataFrame.
     """
-    if products is None:
-        products = get_products(df, cols)
     if isinstance(cols, str):
         cols = [cols]
+    if products is None:
+        products = get_products(df, cols)
 
     if products == []:
         df = df.with_columns(pl.col(f"{cols[0]}").log().diff().alias("log_return"))
@@ -9,6 +9,7 @@ from dspy.features import (
     add_spread,
     add_volume,
     add_vwap,
+    add_book_features,
     add_rel_returns,
     add_log_returns,
     add_sig_pnl,
@@ -81,6 +82,18 @@ class FeatureMethods:
         """
         return add_vwap(self._df, products, cols)
 
+    def add_book_features(
+        self,
+        features: list[str] = ["mid", "spread", "volume", "vwap"],
+        products: list[str] | None = None,
+        prc_cols: list[str] = ["prc_s0", "prc_s1"],
+        vol_cols: list[str] = ["vol_s0", "vol_s1"],
+    ) -> pl.DataFrame:
+        """
+        Add several book features to the DataFrame in one pass.
+        """
+        return add_book_features(self._df, features, products, prc_cols, vol_cols)
+
     def add_rel_returns(
         self, products: list[str] | None = None, cols: list[str] = ["mid"]
     ) -> pl.DataFrame:
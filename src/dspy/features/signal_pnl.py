@@ -2,24 +2,64 @@ import polars as pl
 import numpy as np
 from datetime import datetime, timedelta
 
+from dspy.features.utils import Frame
+from dspy.utils.jit import NUMBA_AVAILABLE, njit
 from dspy.utils.time import str_to_timedelta, timedelta_to_nanoseconds
 
 
+@njit(cache=True)
+def future_prices(ts, prc, horizon, out) -> int:
+    """
+    Find the price as of horizon after each row of a series sorted by time.
+
+    Args:
+        ts: Sorted integer timestamps
+        prc: Prices
+        horizon: Look-ahead in the units of ts
+        out: Output array receiving the last price at or before ts + horizon
+
+    Returns:
+        Number of leading rows whose horizon ends within the series; only these
+        entries of out are written
+    """
+    n = ts.shape[0]
+    if n == 0:
+        return 0
+    last = ts[n - 1] - horizon
+    j = 0
+    for i in range(n):
+        if ts[i] > last:
+            return i
+        target = ts[i] + horizon
+        # Targets only increase, so the future row only moves forward
+        while j + 1 < n and ts[j + 1] <= target:
+            j += 1
+        out[i] = prc[j]
+    return n
+
+
 def add_sig_pnl(
-    df: pl.DataFrame,
+    df: Frame,
     ts_col: str = "ts",
     col: str = "prc",
     signal: str | None = None,
     horizon: str = "1s",
     in_bp: bool = True,
     fee_in_bp: float = 0.0,
-) -> pl.DataFrame:
+) -> Frame:
     """
     Add a signal PnL column to the DataFrame.
+
+    The computation is planned lazily and collected once, or returned as a
+    LazyFrame when given one. With numba installed, a DataFrame with integer
+    timestamps and no missing prices is instead handled by a compiled forward
+    scan for the future prices, with no as-of join.
     """
+    lf = df.lazy()
 
     tdelta = str_to_timedelta(horizon)
-    if df[ts_col].dtype == pl.UInt64 or df[ts_col].dtype == pl.Int64:
+    int_ts = lf.collect_schema()[ts_col] in (pl.UInt64, pl.Int64)
+    if int_ts:
         tdelta = timedelta_to_nanoseconds(tdelta)
 
     expr_diff = pl.col(f"fut_{col}") - pl.col(col)
@@ -28,23 +68,33 @@ def add_sig_pnl(
     if signal is not None:
         expr_diff *= pl.col(signal) if not in_bp else pl.col(signal).sign()
 
-    fut_df = df.select(pl.col(ts_col), pl.col(col).alias(f"fut_{col}"))
-    df = df.filter(pl.col(ts_col) <= pl.col(ts_col).max() - tdelta)
-
-    df_shift = (
-        df.select(
-            [
-                (pl.col(ts_col) + tdelta).alias("ts").set_sorted(),
-                pl.col(col),
-                pl.col(signal),
-            ]
+    if NUMBA_AVAILABLE and int_ts and isinstance(df, pl.DataFrame) and df[col].null_count() == 0:
+        prc = df[col].to_numpy()
+        fut = np.empty_like(prc)
+        n = future_prices(df[ts_col].cast(pl.Int64).to_numpy(), prc, tdelta, fut)
+        return (
+            df.head(n)
+            .with_columns(pl.Series(f"fut_{col}", fut[:n]))
+            .with_columns(expr_diff.alias(f"pnl_sig_{horizon}"))
+            .drop(f"fut_{col}")
         )
-        .join_asof(fut_df, on=ts_col, strategy="backward")
-        .select((expr_diff).alias(f"pnl_sig_{horizon}"))
-    )
 
-    df_sig = pl.concat((df.select(pl.col(ts_col)), df_shift), how="horizontal")
-    return df.join(df_sig, on=ts_col, how="left")
+    # Each row is matched with the last price at or before its horizon; the
+    # matched columns are added to the rows in place, so no join back is needed
+    fut_ts = f"fut_{ts_col}"
+    fut_lf = lf.select(pl.col(ts_col).alias(fut_ts), pl.col(col).alias(f"fut_{col}"))
+    # On a DataFrame the cutoff is a literal, and the max of a sorted column is
+    # read from its last value rather than scanned
+    last_ts = df[ts_col].max() if isinstance(df, pl.DataFrame) else None
+    cutoff = pl.col(ts_col).max() if last_ts is None else pl.lit(last_ts)
+    out = (
+        lf.filter(pl.col(ts_col) <= cutoff - tdelta)
+        .with_columns((pl.col(ts_col) + tdelta).alias(fut_ts).set_sorted())
+        .join_asof(fut_lf, on=fut_ts, strategy="backward")
+        .with_columns(expr_diff.alias(f"pnl_sig_{horizon}"))
+        .drop([fut_ts, f"fut_{col}"])
+    )
+    return out.collect() if isinstance(df, pl.DataFrame) else out
 
 
 def sync_with_book(
@@ -94,7 +144,6 @@ def create_signal_test_dataframes():
             - signal_df: DataFrame with 'ts' and 'trade' columns (8 entries)
             with timestamps interleaved between df's timestamps
     """
-
     start_dt = datetime(2023, 1, 1, 0, 0, 0)
 
     base_ts = pl.DataFrame(
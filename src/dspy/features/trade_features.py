@@ -22,9 +22,12 @@ def agg_trades(
 
 def add_side(df: pl.DataFrame, col: str = "qty") -> pl.DataFrame:
     """
-    Add a side column to the DataFrame.
+    Add a side column to the DataFrame: 1 for positive quantities, else -1.
     """
-    df = df.with_columns(pl.when(pl.col(col) > 0).then(1).otherwise(-1).alias("side"))
+    # Arithmetic on the comparison rather than when/then/otherwise, written as Int8
+    df = df.with_columns(
+        ((pl.col(col) > 0).cast(pl.Int8) * 2 - 1).fill_null(-1).alias("side")
+    )
     return df
 
 
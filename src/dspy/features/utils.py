@@ -2,22 +2,25 @@
 Utility functions for features.
 """
 
+import re
+from typing import TypeVar
+
 import polars as pl
 
+# Feature builders return the same kind of frame they are given, so a chain of
+# them on a LazyFrame stays one query plan until the caller collects it
+Frame = TypeVar("Frame", pl.DataFrame, pl.LazyFrame)
+
 
-def get_products(df: pl.DataFrame, cols: list[str]) -> list[str]:
+def get_products(df: pl.DataFrame | pl.LazyFrame, cols: list[str]) -> list[str]:
     """
     Get the products from the columns.
+
+    A product is the suffix of a column named f"{col}_{product}" for one of
+    cols; products are returned in the order their first column appears.
     """
-    all_columns = df.columns
-    product_parts = []
-    for col in cols:
-        for column_name in all_columns:
-            if column_name.startswith(f"{col}_"):
-                product_part = column_name[len(col) + 1 :]
-                product_parts.append(product_part)
-    if product_parts != []:
-        products = list(set(product_parts))
-    else:
-        products = []
-    return products
+    if not cols:
+        return []
+    pattern = re.compile("(?:" + "|".join(map(re.escape, cols)) + ")_(.+)")
+    names = df.collect_schema().names()
+    return list(dict.fromkeys(m.group(1) for name in names if (m := pattern.fullmatch(name))))
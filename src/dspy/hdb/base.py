@@ -36,6 +36,7 @@ See Also:
 """
 
 import logging
+from collections import OrderedDict
 from pathlib import Path
 from typing import Generator
 
@@ -46,6 +47,57 @@ import polars as pl
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Default budget for cached DataFrames in bytes
+CACHE_BYTES = 4 * 2**30
+
+
+class FrameCache:
+    """
+    Least recently used cache of DataFrames, bounded by their total size.
+
+    Sizes are polars' estimates of the memory held by each frame. A frame
+    larger than the whole budget is not cached.
+    """
+
+    def __init__(self, max_bytes: int = CACHE_BYTES):
+        """
+        Create an empty cache.
+
+        Args:
+            max_bytes: Largest total size of the cached frames in bytes
+        """
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._frames: OrderedDict[str, tuple[pl.DataFrame, int]] = OrderedDict()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._frames
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def __getitem__(self, key: str) -> pl.DataFrame:
+        df, _ = self._frames[key]
+        self._frames.move_to_end(key)
+        return df
+
+    def __setitem__(self, key: str, df: pl.DataFrame):
+        if key in self._frames:
+            self.nbytes -= self._frames.pop(key)[1]
+        size = df.estimated_size()
+        if size > self.max_bytes:
+            return
+        self._frames[key] = (df, size)
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            _, (_, evicted) = self._frames.popitem(last=False)
+            self.nbytes -= evicted
+
+    def clear(self):
+        """Drop all cached frames."""
+        self._frames.clear()
+        self.nbytes = 0
+
 DATA_PATH = Path(__file__).parent.parent.parent.parent / "data"
 
 
@@ -57,9 +109,20 @@ class DataLoader:
     and accessing financial data from various sources.
     """
 
-    def __init__(self, root: str | Path = DATA_PATH, cache: bool = True):
+    def __init__(
+        self,
+        root: str | Path = DATA_PATH,
+        cache: bool = True,
+        cache_bytes: int = CACHE_BYTES,
+    ):
         """
         Initialize the DataLoader with a path to the data.
+
+        Args:
+            root: Directory holding the raw and processed data
+            cache: Whether to keep loaded DataFrames in memory
+            cache_bytes: Memory budget of the cache in bytes; the least recently
+                used frames are dropped beyond it
         """
         logger.info("Initializing DataLoader with path %s" % root)
         self.root = root
@@ -67,7 +130,7 @@ class DataLoader:
         self._processed_path = Path(root) / "processed"
         # maintain a cache of dataframes
         if cache:
-            self.cache = {}
+            self.cache = FrameCache(cache_bytes)
         else:
             self.cache = None
 
@@ -124,7 +187,11 @@ class DataLoader:
             df = self._load_data(product, times, "trade", lazy)
             df = df.with_columns(pl.lit(product).alias("product"))
             dfs.append(df)
-        df = pl.concat(dfs).sort("ts")
+        df = pl.concat(dfs)
+        # A single product's trades are usually in time order already, and
+        # checking that is a linear scan where the sort is not
+        if isinstance(df, pl.LazyFrame) or not df["ts"].is_sorted():
+            df = df.sort("ts")
         return df
 
     def load_book(
@@ -171,7 +238,7 @@ class DataLoader:
             _batch_size: Number of rows per batch
 
         Yields:
-            Polars DataFrame batches
+            Polars DataFrame batches; empty batches are never yielded
         """
         raise NotImplementedError
 
@@ -187,6 +254,6 @@ class DataLoader:
             _batch_size: Number of rows per batch
 
         Yields:
-            Polars DataFrame batches
+            Polars DataFrame batches; empty batches are never yielded
         """
         raise NotImplementedError
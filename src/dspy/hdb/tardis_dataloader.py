@@ -33,10 +33,10 @@ See Also:
     dspy.hdb.registry: Registry for accessing different data sources
 """
 
-import gzip
 import logging
 import os
-import shutil
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Generator
@@ -52,11 +52,19 @@ from dspy.hdb.config import TARDIS_API_KEY
 from dspy.hdb.registry import register_dataset
 from dspy.utils.time import nanoseconds, round_up_to_nearest, str_to_timedelta
 
+try:
+    import rapidgzip
+except ImportError:
+    rapidgzip = None
+
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 TARDIS_DATA_PATH = Path(__file__).parent.parent.parent.parent / "data" / "tardis"
 
+# Maximum number of missing days fetched at once
+DOWNLOAD_WORKERS = 8
+
 
 def get_days(start_date: datetime, end_date: datetime) -> list[str]:
     """
@@ -134,10 +142,18 @@ class TardisData(DataLoader):
         super().__init__(root)
 
     def _load_data(
-        self, product: str, times: list[str], type: str = "book_snapshot_25", lazy=False
+        self,
+        product: str,
+        times: list[str],
+        type: str = "book_snapshot_25",
+        lazy=False,
+        columns: list[str] | None = None,
     ) -> pl.DataFrame:
         """
         Load data for a given product and times.
+
+        Without a cache the files are read by the streaming engine, so only the
+        requested columns of the rows in the window are held in memory.
         """
         if len(times) != 2:
             raise ValueError(
@@ -149,37 +165,54 @@ class TardisData(DataLoader):
             raise ValueError("Times must be in the format '%y%m%d.%H%M%S'")
         days = get_days(dtimes[0], dtimes[1])
 
-        dfs = []
-        for day in days:
-            filename = f"{str(self.processed_path)}/{self.market}_{type}_{day}_{product}.parquet"
-            if not Path(filename).exists():
-                logger.info(f"File {filename} not found, trying to download...")
-                self.download(product, day, type)
-                logger.info("File downloaded, processing...")
-                df = self.process(product, day, type)
-                if df is None:
+        ts_range = pl.col("ts").is_between(nanoseconds(times[0]), nanoseconds(times[1]))
+
+        filenames = [
+            f"{str(self.processed_path)}/{self.market}_{type}_{day}_{product}.parquet"
+            for day in days
+        ]
+        missing = [
+            (day, filename)
+            for day, filename in zip(days, filenames)
+            if not Path(filename).exists()
+        ]
+        if missing:
+            # Days are downloaded and processed concurrently; both wait on the
+            # network or on polars with the GIL released
+            with ThreadPoolExecutor(min(DOWNLOAD_WORKERS, len(missing))) as executor:
+                processed = list(
+                    executor.map(
+                        lambda item: self._fetch(product, item[0], type, item[1]),
+                        missing,
+                    )
+                )
+            # Processed days are written to disk, and cached when first read
+            for (day, filename), lf in zip(missing, processed):
+                if lf is None:
                     logger.info(
                         f"Product {product} with type {type} and day {day} is not available"
                     )
                     return None
-            else:
-                # check if the dataframe is already in the cache
-                if self.cache is not None and filename in self.cache and not lazy:
-                    df = self.cache[filename]
-                else:
-                    if lazy:
-                        df = pl.scan_parquet(filename)
-                    else:
-                        df = pl.read_parquet(filename)
-                        if self.cache is not None:
-                            self.cache[filename] = df
-            dfs.append(df)
 
-        df = pl.concat(dfs)
-        df = df.filter(
-            pl.col("ts").is_between(nanoseconds(times[0]), nanoseconds(times[1]))
-        )
-        return df
+        if self.cache is None or lazy:
+            # One scan over all the days, so the time filter prunes row groups
+            lf = pl.scan_parquet(filenames).filter(ts_range)
+            if columns is not None:
+                lf = lf.select(columns)
+            return lf if lazy else lf.collect(engine="streaming")
+
+        # Whole days are cached, so later calls for other windows reuse them;
+        # each is cut to the window before the days are joined
+        dfs = []
+        for filename in filenames:
+            if filename in self.cache:
+                df = self.cache[filename]
+            else:
+                df = pl.read_parquet(filename)
+                self.cache[filename] = df
+            df = df.filter(ts_range)
+            dfs.append(df if columns is None else df.select(columns))
+        return pl.concat(dfs)
 
     def load_book(
         self,
@@ -191,8 +224,10 @@ class TardisData(DataLoader):
     ) -> pl.DataFrame:
         """
         Load book data for a given product and times.
+
+        Snapshots that repeat the previous one at the requested depth are
+        dropped, so each row is a change of the book.
         """
-        df = self._load_data(product, times, type, lazy)
         price_columns = [
             [
                 f"asks[{i}].price",
@@ -204,9 +239,13 @@ class TardisData(DataLoader):
         ]
         price_columns = [col for sublist in price_columns for col in sublist]
         columns = ["ts", "ts_local"] + price_columns
-        df = df.select(columns)
-        df = df.unique(subset=price_columns, maintain_order=True)
-        return df
+        df = self._load_data(product, times, type, lazy, columns)
+        # Snapshots are in time order, so comparing each row with the one before
+        # finds the changes in a single pass, with no hash table of book states
+        changed = pl.any_horizontal(
+            pl.col(col).ne_missing(pl.col(col).shift()) for col in price_columns
+        )
+        return df.filter(changed)
     
     def load_trades(
         self,
@@ -251,7 +290,8 @@ class TardisData(DataLoader):
             lazy: Whether to use lazy loading
 
         Returns:
-            DataFrame with timestamp and computed columns for each product
+            DataFrame with timestamp and computed columns for each product, or a
+            LazyFrame if lazy is set
         """
         # Convert single product to list for uniform processing
         if isinstance(products, str):
@@ -262,28 +302,33 @@ class TardisData(DataLoader):
         for product in products:
             df = self.load_book(
                 product, times, depth=1, lazy=lazy, type="book_snapshot_25"
-            ).sort("ts")
+            )
             if lazy:
+                df = df.sort("ts")
                 columns = df.collect_schema().names()
             else:
+                # Snapshots are almost always in time order already, and checking
+                # that is a linear scan where the sort is not
+                if not df["ts"].is_sorted():
+                    df = df.sort("ts")
                 columns = df.columns
-            # Rename columns to include product name (except timestamps)
+            # Rename columns to include product name, keeping only the
+            # exchange timestamp as a datetime for resampling
             rename_map = {
                 col: f"{col}_{product}"
                 for col in columns
                 if col not in ["ts", "ts_local"]
             }
-            df = df.rename(rename_map)
+            # The datetimes are in the order of ts, so marking them sorted spares
+            # the as-of joins below from checking
+            df = (
+                df.rename(rename_map)
+                .ds.add_datetime()
+                .drop(["ts", "ts_local"])
+                .set_sorted("dts")
+            )
             dfs.append(df)
 
-        # Merge all products on timestamp using asof joins
-        merged_df = dfs[0]
-        for df in dfs[1:]:
-            merged_df = merged_df.join_asof(df, on="ts")
-
-        # Add datetime column for resampling
-        merged_df = merged_df.ds.add_datetime()
-
         # Parse time range for resampling
         dtimes = [datetime.strptime(t, "%y%m%d.%H%M%S") for t in times]
         try:
@@ -291,16 +336,25 @@ class TardisData(DataLoader):
         except ValueError:
             raise ValueError(f"Invalid frequency: {freq}")
 
-        # Create regular time grid
-        min_dt = round_up_to_nearest(merged_df["dts"][0], td)
+        # Create regular time grid, starting with the first product's data
+        first_dt = dfs[0].select(pl.col("dts").first())
+        if lazy:
+            first_dt = first_dt.collect()
+        min_dt = round_up_to_nearest(first_dt.item(), td)
         max_dt = dtimes[1]
 
         time_grid = pl.DataFrame(
             {"dts": pl.datetime_range(min_dt, max_dt, freq, time_unit="ns", eager=True)}
         )
+        if lazy:
+            time_grid = time_grid.lazy()
 
-        # Sample data at fixed frequency using backward fill
-        sampled_df = time_grid.join_asof(merged_df, on="dts", strategy="backward")
+        # Sample each product at the grid times using backward fill. Joining onto
+        # the grid directly scans each book once, with no merged timeline of all
+        # the products' updates
+        sampled_df = time_grid
+        for df in dfs:
+            sampled_df = sampled_df.join_asof(df, on="dts", strategy="backward")
 
         # Compute derived columns for each product
         select_cols = [pl.col("dts").alias("ts")]
@@ -340,6 +394,15 @@ class TardisData(DataLoader):
 
         return result_df
 
+    def _fetch(self, product: str, day: str, type: str, filename: str) -> pl.LazyFrame:
+        """
+        Download and process one missing day.
+        """
+        logger.info(f"File {filename} not found, trying to download...")
+        self.download(product, day, type)
+        logger.info("File downloaded, processing...")
+        return self.process(product, day, type)
+
     def download(self, product: str, day: str, type: str):
         """
         Download data for a given product and day.
@@ -356,32 +419,41 @@ class TardisData(DataLoader):
             get_filename=default_file_name,
         )
 
-    def process(self, product: str, day: str, type: str):
+    def process(self, product: str, day: str, type: str) -> pl.LazyFrame:
         """
         Process data for a given product and day.
+
+        The CSV is parsed, converted and written to parquet in batches by the
+        streaming engine, so the day is never held in memory as a whole.
+
+        Returns:
+            LazyFrame scanning the processed parquet file
         """
         schema = generate_schema(type)
         filename = f"{str(self.raw_path)}/{self.market}_{type}_{day}_{product}.csv.gz"
-        with (
-            gzip.open(filename, "rb") as f_in,
-            open(filename.replace(".gz", ""), "wb") as f_out,
-        ):
-            shutil.copyfileobj(f_in, f_out)
-        df = pl.read_csv(filename.replace(".gz", ""), schema=schema)
-        df = df.rename(
-            {"timestamp": "ts", "local_timestamp": "ts_local", "symbol": "product"}
-        )
         outfilename = (
             f"{str(self.processed_path)}/{self.market}_{type}_{day}_{product}.parquet"
         )
-        df = df.with_columns(
-            pl.col("ts").mul(1000).cast(pl.Int64).alias("ts"),
-            pl.col("ts_local").mul(1000).cast(pl.Int64).alias("ts_local"),
-        )
-        df = df.select(["ts", "ts_local", "product"] + list(schema.keys())[4:])
-        df.write_parquet(outfilename)
-        os.remove(filename.replace(".gz", ""))
-        return df
+        # The file is decompressed in memory, with no decompressed copy on disk;
+        # rapidgzip spreads the decompression over all cores where polars uses one
+        if rapidgzip is not None:
+            source = rapidgzip.open(filename, parallelization=os.cpu_count())
+        else:
+            source = nullcontext(filename)
+        with source as f:
+            (
+                pl.scan_csv(f, schema=schema)
+                .rename(
+                    {"timestamp": "ts", "local_timestamp": "ts_local", "symbol": "product"}
+                )
+                .with_columns(
+                    pl.col("ts").mul(1000).cast(pl.Int64).alias("ts"),
+                    pl.col("ts_local").mul(1000).cast(pl.Int64).alias("ts_local"),
+                )
+                .select(["ts", "ts_local", "product"] + list(schema.keys())[4:])
+                .sink_parquet(outfilename)
+            )
+        return pl.scan_parquet(outfilename)
 
     def stream_book(
         self, product: str, times: list[str], depth: int = 10, batch_size: int = 10000
@@ -396,7 +468,7 @@ class TardisData(DataLoader):
             batch_size: Number of rows per batch
 
         Yields:
-            Polars DataFrame batches
+            Polars DataFrame batches; empty batches are never yielded
         """
         if len(times) != 2:
             raise ValueError(
@@ -478,7 +550,7 @@ class TardisData(DataLoader):
             batch_size: Number of rows per batch
 
         Yields:
-            Polars DataFrame batches
+            Polars DataFrame batches; empty batches are never yielded
         """
         if len(times) != 2:
             raise ValueError(
@@ -522,11 +594,11 @@ class TardisData(DataLoader):
                         pl.col("ts").is_between(start_ns, end_ns)
                     )
 
-                    # Add product column
-                    batch_df = batch_df.with_columns(pl.lit(product).alias("product"))
+                    if batch_df.height == 0:
+                        continue
 
-                    if batch_df.height > 0:
-                        yield batch_df
+                    # Add product column
+                    yield batch_df.with_columns(pl.lit(product).alias("product"))
 
             except Exception as e:
                 logger.error(f"Error streaming file {filename}: {e}")
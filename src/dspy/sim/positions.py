@@ -5,66 +5,148 @@ Add position tracking columns to the DataFrame.
 import polars as pl
 import datetime
 
+import numpy as np
+
+from dspy.utils.jit import NUMBA_AVAILABLE, njit
+
+
+@njit(cache=True)
+def position_pnl(
+    order: np.ndarray, prc: np.ndarray, fee: float, pos: np.ndarray, pnl: np.ndarray
+) -> None:
+    """
+    Track the position and cumulative PnL of one product in a single pass.
+
+    Args:
+        order: Signed order size at each step
+        prc: Price at each step
+        fee: Fee as a fraction of the traded notional
+        pos: Output array receiving the position after each order
+        pnl: Output array receiving the cumulative PnL
+    """
+    inv = 0.0
+    cum = 0.0
+    for i in range(order.shape[0]):
+        # Mark-to-market on the position held over the step, less fees on the order
+        local = inv * (prc[i] - prc[i - 1]) if i > 0 else 0.0
+        cum += local - prc[i] * fee * abs(order[i])
+        inv += order[i]
+        pos[i] = inv
+        pnl[i] = cum
+
 
 def add_positions(
-    df: pl.DataFrame,
+    df: pl.DataFrame | pl.LazyFrame,
     products: list[str] = ["BTCUSD"],
     price_type: str = "mid",
     order_cols: list[str] = ["pos"],
     fees_bps: list[float] = [0.0],
-) -> pl.DataFrame:
+    dtype: pl.DataType | None = None,
+) -> pl.DataFrame | pl.LazyFrame:
     """
     Add position tracking columns to the DataFrame.
 
+    The columns are planned lazily and collected once, or returned as a
+    LazyFrame when given one. With numba installed, a DataFrame of Float64
+    orders and prices with no missing values is instead handled by one compiled
+    pass per product.
+
     Args:
         df: Input DataFrame
-        price_cols: Column names for prices
-        order_cols: Column names for orders
-        fees_bps: List of fees in basis points
+        products: Products, priced by the columns f'{price_type}_{product}'
+        price_type: Prefix of the price columns
+        order_cols: Column names for orders, one per product
+        fees_bps: List of fees in basis points, one per product
+        dtype: Float type to compute in, e.g. pl.Float32 to halve the memory
+            traffic of long runs at the cost of precision in the cumulative PnL;
+            the input dtypes are kept if None
 
     Returns:
         DataFrame with added position tracking columns:
-        - 'inventory': Current inventory in the product
-        - f'pnl_{price_col}': Cumulative profit and loss for the price column
+        - f'pos_{product}': Current inventory in the product
+        - f'pnl_{product}': Cumulative profit and loss for the product
         - 'pnl': Cumulative profit and loss of portfolio
     """
-    price_cols = [f"{price_type}_{product}" for product in products]
     fees = [fee_bps / 10_000 for fee_bps in fees_bps]
+    if NUMBA_AVAILABLE and isinstance(df, pl.DataFrame) and dtype in (None, pl.Float64):
+        inputs = [
+            (df[order_cols[i]], df[f"{price_type}_{product}"])
+            for i, product in enumerate(products)
+        ]
+        if all(
+            s.dtype == pl.Float64 and s.null_count() == 0
+            for pair in inputs
+            for s in pair
+        ):
+            return _add_positions_compiled(df, products, inputs, fees)
+
+    # Positions for all products, then PnL for all products with the total, each
+    # stage as one with_columns call so polars evaluates the products in parallel.
+    # Positions are referenced by name; written inline, polars would compute each
+    # cumulative sum twice
+    pos_exprs = []
+    pnl_exprs = []
     for i, product in enumerate(products):
-        df = df.with_columns(pl.col(order_cols[i]).cum_sum().alias(f"pos_{product}"))
-        df = df.with_columns(
-            (
-                pl.col(f"pos_{product}").shift(1)
-                * (pl.col(price_cols[i]) - pl.col(price_cols[i]).shift(1))
-            )
-            .fill_null(0)
-            .alias("local_pnl")
-        )
-        df = df.with_columns(
-            (
-                pl.col("local_pnl")
-                - pl.col(price_cols[i]).mul(fees[i]).mul(pl.col(order_cols[i]).abs())
-            ).alias(f"local_pnl_{product}")
-        ).drop("local_pnl")
-        df = df.with_columns(
-            pl.col(f"local_pnl_{product}").cum_sum().alias(f"pnl_{product}")
-        ).drop([f"local_pnl_{product}"])
-
-    pnl_cols = [f"pnl_{product}" for product in products]
+        order = pl.col(order_cols[i])
+        price = pl.col(f"{price_type}_{product}")
+        if dtype is not None:
+            order = order.cast(dtype)
+            price = price.cast(dtype)
+        pos_exprs.append(order.cum_sum().alias(f"pos_{product}"))
+        # Mark-to-market on the position held over each step, less fees on the order
+        local_pnl = (pl.col(f"pos_{product}").shift(1) * (price - price.shift(1))).fill_null(0)
+        local_pnl = local_pnl - price * fees[i] * order.abs()
+        pnl_exprs.append(local_pnl.cum_sum().alias(f"pnl_{product}"))
+
+    if len(products) == 1:
+        # The portfolio PnL is the product's
+        total = pnl_exprs[0].alias("pnl")
+    else:
+        total = pl.sum_horizontal(pnl_exprs).alias("pnl")
+    # The total shares the product PnL expressions, which polars evaluates once
+    out = df.lazy().with_columns(pos_exprs).with_columns(*pnl_exprs, total)
+    out = out.select(_ordered_columns(products))
+    return out.collect() if isinstance(df, pl.DataFrame) else out
+
+
+def _ordered_columns(products: list[str]) -> list[pl.Expr]:
+    """Order the columns of add_positions as pos_A, pnl_A, pos_B, pnl_B, ..., pnl."""
+    new = [f"{kind}_{product}" for product in products for kind in ("pos", "pnl")]
+    new.append("pnl")
+    return [pl.all().exclude(new), *new]
+
+
+def _add_positions_compiled(
+    df: pl.DataFrame,
+    products: list[str],
+    inputs: list[tuple[pl.Series, pl.Series]],
+    fees: list[float],
+) -> pl.DataFrame:
+    """Add the columns of add_positions with position_pnl, one pass per product."""
+    pos_cols = []
+    pnl_cols = []
+    for product, (order, price), fee in zip(products, inputs, fees):
+        pos = np.empty(len(df), dtype=np.float64)
+        pnl = np.empty(len(df), dtype=np.float64)
+        position_pnl(order.to_numpy(), price.to_numpy(), fee, pos, pnl)
+        pos_cols.append(pl.Series(f"pos_{product}", pos))
+        pnl_cols.append(pl.Series(f"pnl_{product}", pnl))
     if len(pnl_cols) == 1:
-        df = df.with_columns(pl.col(pnl_cols[0]).alias("pnl"))
+        df = df.with_columns(pos_cols + pnl_cols + [pnl_cols[0].alias("pnl")])
     else:
-        df = df.with_columns(pl.sum_horizontal(pnl_cols).alias("pnl"))
-    return df
+        df = df.with_columns(pos_cols + pnl_cols)
+        df = df.with_columns(pl.sum_horizontal([s.name for s in pnl_cols]).alias("pnl"))
+    return df.select(_ordered_columns(products))
 
 
 def rebalance_positions(
-    df: pl.DataFrame,
+    df: pl.DataFrame | pl.LazyFrame,
     products: list[str] = ["BTCUSD"],
     price_type: str = "mid",
     pos_cols: list[str] = ["pos"],
     fees_bps: list[float] = [0.0],
-) -> pl.DataFrame:
+    dtype: pl.DataType | None = None,
+) -> pl.DataFrame | pl.LazyFrame:
     """
     Rebalance positions in the DataFrame.
     """
@@ -72,7 +154,7 @@ def rebalance_positions(
         [
             pl.col(pos_cols[i])
             .diff(null_behavior="ignore")
-            .fill_null(df[pos_cols[i]][0])
+            .fill_null(pl.col(pos_cols[i]).first())
             .alias(f"order_{product}")
             for i, product in enumerate(products)
         ]
@@ -84,6 +166,7 @@ def rebalance_positions(
         price_type=price_type,
         order_cols=order_cols,
         fees_bps=fees_bps,
+        dtype=dtype,
     )
     return df
 
@@ -0,0 +1,57 @@
+"""
+Compiled signal kernels for simulation strategies.
+"""
+
+import numpy as np
+
+from dspy.utils.jit import njit
+
+
+@njit(cache=True)
+def compute_signal(window: np.ndarray, threshold: float) -> tuple[int, float, float]:
+    """
+    Evaluate a mean-reversion signal on a window of prices.
+
+    Args:
+        window: 1-D array of prices, oldest first; the last entry is the current price
+        threshold: Relative deviation from the moving average that triggers a signal
+
+    Returns:
+        Tuple (signal, ma, deviation) where signal is 1 (buy) if the current price
+        is more than threshold below the moving average, -1 (sell) if it is more than
+        threshold above it, and 0 otherwise.
+    """
+    n = window.shape[0]
+    s = 0.0
+    for k in range(n):
+        s += window[k]
+    ma = s / n
+    deviation = (window[n - 1] - ma) / ma
+    if deviation < -threshold:
+        return 1, ma, deviation
+    if deviation > threshold:
+        return -1, ma, deviation
+    return 0, ma, deviation
+
+
+@njit(cache=True)
+def compute_signals(
+    window: np.ndarray,
+    threshold: float,
+    signals: np.ndarray,
+    mas: np.ndarray,
+    deviations: np.ndarray,
+) -> None:
+    """
+    Evaluate mean-reversion signals for several symbols in a single call.
+
+    Args:
+        window: 2-D array of prices with one row per tick (oldest first) and one
+            column per symbol
+        threshold: Relative deviation from the moving average that triggers a signal
+        signals: Output array receiving the signal of each symbol (see compute_signal)
+        mas: Output array receiving the moving average of each symbol
+        deviations: Output array receiving the relative deviation of each symbol
+    """
+    for k in range(window.shape[1]):
+        signals[k], mas[k], deviations[k] = compute_signal(window[:, k], threshold)
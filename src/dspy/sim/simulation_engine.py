@@ -435,6 +435,20 @@ class SimulationEngine(Exchange):
         data = self.current_data[symbol]
         return (data["bids[0].price"] + data["asks[0].price"]) / 2
 
+    def get_mids(self, symbols: List[str]) -> np.ndarray:
+        """Return best mid prices for several symbols in one call."""
+        current_data = self.current_data
+        mids = np.empty(len(symbols), dtype=np.float64)
+
+        for k, symbol in enumerate(symbols):
+            if symbol not in current_data:
+                raise ValueError(f"No data available for symbol {symbol}")
+
+            data = current_data[symbol]
+            mids[k] = (data["bids[0].price"] + data["asks[0].price"]) / 2
+
+        return mids
+
     def get_orderbook(self, symbol: str, depth: int = 25) -> dict:
         """Return orderbook for product."""
         if symbol not in self.current_data:
@@ -0,0 +1,30 @@
+"""
+Optional JIT compilation helpers for the DSPy framework.
+
+Numba is an optional dependency. When it is installed, ``njit`` is numba's
+``njit``; otherwise it is a no-op decorator so that kernels still run as plain
+Python (and NumPy) code. ``NUMBA_AVAILABLE`` tells callers whether kernels are
+compiled, for code paths that are only worth taking when they are.
+"""
+
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba not installed, fall back to pure Python
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """
+        No-op stand-in for numba.njit, usable both bare and with arguments.
+        """
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
+
+
+__all__ = ["njit", "NUMBA_AVAILABLE"]
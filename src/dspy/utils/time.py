@@ -9,6 +9,7 @@ from typing import Union
 import calendar
 import re
 from datetime import datetime, timedelta
+from functools import lru_cache
 import pytz
 
 
@@ -38,9 +39,13 @@ def nanoseconds(input: Union[str, datetime]) -> int:
     return timestamp
 
 
+@lru_cache(maxsize=128)
 def timedelta_to_nanoseconds(td: timedelta) -> int:
     """
     Convert a timedelta to a nanoseconds.
+
+    Results are cached, as the same few horizons are converted on every call
+    of the features and loaders.
     """
     return int(td.total_seconds() * 1_000_000_000)
 
@@ -57,9 +62,12 @@ def round_up_to_nearest(dt: datetime, td: timedelta) -> datetime:
     return dt
 
 
+@lru_cache(maxsize=128)
 def str_to_timedelta(s: str) -> timedelta:
     """
     Convert a string like '30s' to a timedelta.
+
+    Results are cached; invalid strings are not.
     """
     match = re.fullmatch(r"(\d+)(ns|us|ms|s|m|h)", s)
     if not match:
@@ -0,0 +1,50 @@
+"""
+Tests for the local order book kept from Bybit WebSocket messages.
+"""
+
+from pybit._websocket_stream import _V5WebSocketManager
+
+from dspy.api.bybit.local_book import LocalBook
+
+TOPIC = "orderbook.50.BTCUSDT"
+
+
+def _message(type: str, ts: int, bids: list, asks: list, update_id: int) -> dict:
+    return {
+        "topic": TOPIC,
+        "type": type,
+        "ts": ts,
+        "data": {"s": "BTCUSDT", "b": bids, "a": asks, "u": update_id, "seq": update_id},
+    }
+
+
+def test_book_follows_pybit_snapshots():
+    """pybit applies deltas itself and passes its unsorted book as a snapshot."""
+    manager = _V5WebSocketManager("test", testnet=False)
+    book = LocalBook()
+    manager._set_callback(TOPIC, book.apply)
+
+    manager._process_normal_message(
+        _message("snapshot", 1, [["100", "1"], ["99", "1"]], [["101", "1"], ["102", "1"]], 1)
+    )
+    assert book.top() == (100.0, 1.0, 101.0, 1.0)
+
+    manager._process_normal_message(
+        _message("delta", 2, [["100", "0"], ["100.5", "2"]], [["101", "0"], ["100.8", "3"]], 2)
+    )
+    assert book.top() == (100.5, 2.0, 100.8, 3.0)
+
+    bids, asks, ts, _ = book.levels(5)
+    assert bids[:, 0].tolist() == [100.5, 99.0]
+    assert asks[:, 0].tolist() == [100.8, 102.0]
+    assert ts == 2
+
+
+def test_book_applies_deltas():
+    book = LocalBook()
+    book.apply(_message("snapshot", 1, [["100", "1"], ["99", "1"]], [["101", "1"], ["102", "1"]], 1))
+    book.apply(_message("delta", 2, [["100", "0"], ["100.5", "2"]], [["101", "0"], ["100.8", "3"]], 2))
+
+    bids, asks, _, _ = book.levels(5)
+    assert bids.tolist() == [[100.5, 2.0], [99.0, 1.0]]
+    assert asks.tolist() == [[100.8, 3.0], [102.0, 1.0]]